@@ -8,6 +8,8 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Set, Optional, Any
 import os
 import json
+import copy
+import functools
 from pathlib import Path
 
 @dataclass
@@ -557,8 +559,24 @@ def create_semantic_config(preset: str = "balanced", **overrides) -> BinarySeman
         **overrides: Parâmetros específicos para sobrescrever
     
     Returns:
-        Configuração personalizada
+        Configuração personalizada (cópia independente; pode ser alterada pelo chamador)
     """
+    overrides_key = tuple(sorted(overrides.items()))
+    try:
+        hash(overrides_key)
+    except TypeError:
+        # Overrides com listas/dicts não podem ser chave de cache
+        return _build_semantic_config(preset, **overrides)
+    
+    return copy.deepcopy(_cached_semantic_config(preset, overrides_key))
+
+@functools.lru_cache(maxsize=8)
+def _cached_semantic_config(preset: str, overrides_key: tuple) -> BinarySemanticConfig:
+    """Configuração construída e validada uma única vez por (preset, overrides)"""
+    return _build_semantic_config(preset, **dict(overrides_key))
+
+def _build_semantic_config(preset: str, **overrides) -> BinarySemanticConfig:
+    """Monta e valida a configuração do preset com os overrides aplicados"""
     preset_map = {
         'balanced': PresetConfigurations.balanced,
         'high_precision': PresetConfigurations.high_precision,
@@ -7,6 +7,8 @@ from typing import Dict, List, Tuple, Optional, Any, Set
 from dataclasses import dataclass, asdict
 from pathlib import Path
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 warnings.filterwarnings('ignore')
 
 # Adicionar diretório do projeto ao path
@@ -34,6 +36,13 @@ import spacy
 import yake
 from sentence_transformers import SentenceTransformer
 
+# Automato Aho-Corasick (opcional) para a busca de palavras-chave
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Imports do projeto
 try:
     from app.models.database import get_db_connection
@@ -75,6 +84,15 @@ ML_CONFIG = {
     'min_samples_per_class': 10
 }
 
+# Componentes do spaCy não usados pela classificação binária (apenas tokenização/POS)
+SPACY_DISABLED_COMPONENTS = ["ner", "parser", "attribute_ruler", "lemmatizer"]
+
+# Lotes menores que isso são classificados no próprio processo
+PARALLEL_MIN_TEXTS = 1000
+
+# Categorias pontuadas por ocorrência de termos no texto
+KEYWORD_CATEGORIES = ('palavras_suspeitas', 'padroes_cobertura', 'contexto_criminal', 'indicadores_criticos')
+
 @dataclass
 class AgentTrainingConfig:
     """Configuração específica para treinamento de agentes"""
@@ -115,6 +133,9 @@ class BinarySemanticClassifier:
         self.embedder = None
         self.yake_extractor = None
         self.contexts = None
+        self._keyword_tables = None
+        self._keyword_automaton = None
+        self._term_counts = None
         
     def load_nlp_models(self):
         """Carrega modelos de NLP necessários"""
@@ -122,7 +143,7 @@ class BinarySemanticClassifier:
         
         # SpaCy
         try:
-            self.nlp = spacy.load(ML_CONFIG['spacy_model'], disable=["tagger", "parser", "lemmatizer"])
+            self.nlp = spacy.load(ML_CONFIG['spacy_model'], disable=SPACY_DISABLED_COMPONENTS)
             print(f"✅ SpaCy modelo carregado: {ML_CONFIG['spacy_model']}")
         except IOError:
             print(f"❌ Erro ao carregar modelo SpaCy: {ML_CONFIG['spacy_model']}")
@@ -199,38 +220,73 @@ class BinarySemanticClassifier:
             palavras_criticas=palavras_criticas
         )
         
+    def _build_keyword_tables(self) -> Dict[str, Tuple[str, ...]]:
+        """Normaliza (lowercase) as listas de termos uma única vez por conjunto de contextos"""
+        return {
+            'palavras_suspeitas': tuple(self.contexts.palavras_suspeitas),
+            'padroes_cobertura': tuple(h.lower() for h in self.contexts.historias_cobertura),
+            'contexto_criminal': tuple(c.lower() for c in self.contexts.contextos_suspeitos),
+            'indicadores_criticos': tuple(self.contexts.palavras_criticas)
+        }
+        
+    def _build_keyword_automaton(self):
+        """Monta um único automato com todos os termos; cada termo aponta para sua linha de contagens"""
+        terms = {}
+        for category_idx, category in enumerate(KEYWORD_CATEGORIES):
+            for term in self._keyword_tables[category]:
+                terms.setdefault(term, [0] * len(KEYWORD_CATEGORIES))[category_idx] += 1
+        
+        if not terms:
+            return None, None
+        
+        automaton = ahocorasick.Automaton()
+        for term_idx, term in enumerate(terms):
+            automaton.add_word(term, term_idx)
+        automaton.make_automaton()
+        
+        return automaton, np.array(list(terms.values()), dtype=np.int32)
+        
+    def _count_keyword_hits(self, texto_lower: str) -> Dict[str, int]:
+        """Conta, por categoria, quantos termos aparecem no texto"""
+        if self._keyword_automaton is not None:
+            # Uma única passada linear no texto; termos repetidos contam uma vez
+            hits = {term_idx for _, term_idx in self._keyword_automaton.iter(texto_lower)}
+            if not hits:
+                return dict.fromkeys(KEYWORD_CATEGORIES, 0)
+            counts = self._term_counts[list(hits)].sum(axis=0)
+            return {category: int(count) for category, count in zip(KEYWORD_CATEGORIES, counts)}
+        
+        contains = texto_lower.__contains__
+        return {
+            category: sum(map(contains, self._keyword_tables[category]))
+            for category in KEYWORD_CATEGORIES
+        }
+        
     def calculate_suspicion_score(self, texto: str) -> Tuple[float, Dict[str, float]]:
         """Calcula score de suspeição com detalhamento por categoria"""
         if not self.contexts:
             self.contexts = self.load_contexts()
+        if self._keyword_tables is None:
+            self._keyword_tables = self._build_keyword_tables()
+            if AHOCORASICK_AVAILABLE:
+                self._keyword_automaton, self._term_counts = self._build_keyword_automaton()
             
         texto_lower = texto.lower()
+        hits = self._count_keyword_hits(texto_lower)
         scores = {}
         
         # 1. Análise de palavras suspeitas
-        palavras_encontradas = sum(1 for palavra in self.contexts.palavras_suspeitas 
-                                 if palavra in texto_lower)
         total_palavras = len(texto.split())
-        scores['palavras_suspeitas'] = min(palavras_encontradas / max(total_palavras * 0.1, 1), 1.0)
+        scores['palavras_suspeitas'] = min(hits['palavras_suspeitas'] / max(total_palavras * 0.1, 1), 1.0)
         
         # 2. Padrões de cobertura criminal
-        cobertura_score = 0
-        for historia in self.contexts.historias_cobertura:
-            if historia.lower() in texto_lower:
-                cobertura_score += 0.3
-        scores['padroes_cobertura'] = min(cobertura_score, 1.0)
+        scores['padroes_cobertura'] = min(0.3 * hits['padroes_cobertura'], 1.0)
         
         # 3. Contextos criminais específicos
-        contexto_score = 0
-        for contexto in self.contexts.contextos_suspeitos:
-            if contexto.lower() in texto_lower:
-                contexto_score += 0.2
-        scores['contexto_criminal'] = min(contexto_score, 1.0)
+        scores['contexto_criminal'] = min(0.2 * hits['contexto_criminal'], 1.0)
         
         # 4. Palavras críticas (alto impacto)
-        criticas_score = sum(0.4 for palavra in self.contexts.palavras_criticas 
-                           if palavra in texto_lower)
-        scores['indicadores_criticos'] = min(criticas_score, 1.0)
+        scores['indicadores_criticos'] = min(0.4 * hits['indicadores_criticos'], 1.0)
         
         # 5. Análise de inconsistências narrativas
         inconsistencias = self._detect_narrative_inconsistencies(texto)
@@ -302,6 +358,33 @@ class BinarySemanticClassifier:
         }
         
         return label, confidence, metadata
+        
+    def classify_texts_batch(self, textos: List[str], n_process: Optional[int] = None) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """Classificação binária de vários textos em uma única chamada (multiprocesso em lotes grandes)"""
+        # Contextos carregados uma vez para todo o lote
+        if not self.contexts:
+            self.contexts = self.load_contexts()
+            
+        if n_process is None:
+            n_process = max(1, (os.cpu_count() or 1) - 1)
+        if sys.platform.startswith('win'):
+            n_process = 1
+            
+        if n_process == 1 or len(textos) < PARALLEL_MIN_TEXTS:
+            return [self.classify_text_binary(texto) for texto in textos]
+            
+        batch_size = max(1, len(textos) // (n_process * 2))
+        batches = [textos[i:i + batch_size] for i in range(0, len(textos), batch_size)]
+        
+        with ProcessPoolExecutor(max_workers=n_process) as executor:
+            partial_results = executor.map(_classify_batch, repeat(self.config), repeat(self.contexts), batches)
+            return [result for batch_results in partial_results for result in batch_results]
+
+def _classify_batch(config: AgentTrainingConfig, contexts: SemanticContext, textos: List[str]) -> List[Tuple[str, float, Dict[str, Any]]]:
+    """Classifica um lote em um processo filho (apenas regras, sem modelos NLP)"""
+    classifier = BinarySemanticClassifier(config)
+    classifier.contexts = contexts
+    return [classifier.classify_text_binary(texto) for texto in textos]
 
 # =============================================================================
 # TREINAMENTO COM DADOS REAIS
@@ -492,19 +575,20 @@ class AgentSemanticTrainer:
                 "Mostrou documentos que comprovaram sua versão"
             ]
         
-        # Adicionar casos sintéticos
-        added_count = 0
-        for i in range(synthetic_count):
-            example = synthetic_examples[i % len(synthetic_examples)]
-            
-            # Adicionar variação para evitar duplicatas
-            if i >= len(synthetic_examples):
-                variation = f" conforme procedimento policial número {i+1:04d}"
-                example = f"{example}{variation}"
-            
-            textos.append(example)
-            labels.append(missing_class)
-            added_count += 1
+        # Adicionar casos sintéticos (repetição da lista base em C, sem laço por exemplo)
+        base_count = len(synthetic_examples)
+        repeats = (synthetic_count + base_count - 1) // base_count
+        examples_to_add = (synthetic_examples * repeats)[:synthetic_count]
+        
+        # Adicionar variação para evitar duplicatas (apenas nas repetições)
+        examples_to_add[base_count:] = [
+            f"{example} conforme procedimento policial número {i:04d}"
+            for i, example in enumerate(examples_to_add[base_count:], base_count + 1)
+        ]
+        
+        textos.extend(examples_to_add)
+        labels.extend([missing_class] * synthetic_count)
+        added_count = synthetic_count
         
         print(f"   ✅ Adicionados {added_count} casos sintéticos de {missing_class}")
         
@@ -1100,13 +1184,13 @@ def test_trained_model(sample_texts: List[str] = None) -> bool:
     classifier = BinarySemanticClassifier(config)
     classifier.load_nlp_models()
     
-    for i, texto in enumerate(sample_texts, 1):
+    # Classificação usando regras inteligentes (lote único)
+    results = classifier.classify_texts_batch(sample_texts)
+    
+    for i, (texto, (label, confidence, metadata)) in enumerate(zip(sample_texts, results), 1):
         print(f"\n{i:2d}. Texto: {texto}")
         print("    " + "-" * 60)
         
-        # Classificação usando regras inteligentes
-        label, confidence, metadata = classifier.classify_text_binary(texto)
-        
         # Determinar cor baseado na classificação
         emoji = "🔴" if label == "SUSPEITO" else "🟢"
         
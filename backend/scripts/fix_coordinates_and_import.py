@@ -16,6 +16,9 @@ sys.path.insert(0, str(backend_dir))
 from app.models.database import DatabaseConfig, get_db_connection
 import psycopg
 
+# Data brasileira com dia/mês de um ou dois dígitos: "15/1/2024, 10:30:00"
+BR_DATE_RE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4}), ([^,]+)')
+
 def fix_coordinate_format(value):
     """Converte coordenadas do formato brasileiro (vírgula) para formato internacional (ponto)"""
     if pd.isna(value) or value == '' or str(value).lower() == 'null':
@@ -53,18 +56,16 @@ def fix_date_format(value):
     
     str_value = str(value).strip()
     
-    # Formato: DD/MM/YYYY, HH:MM:SS
+    # Formato: DD/MM/YYYY, HH:MM:SS (uma única regex pré-compilada em vez de dois split)
+    match = BR_DATE_RE.fullmatch(str_value)
+    if match:
+        day, month, year, time_part = match.groups()
+        # Reorganizar para YYYY-MM-DD HH:MM:SS
+        return f"{year}-{month.zfill(2)}-{day.zfill(2)} {time_part}"
+    
+    # Parece data brasileira mas não segue o formato
     if '/' in str_value and ',' in str_value:
-        try:
-            # Separar data e hora
-            date_part, time_part = str_value.split(', ')
-            day, month, year = date_part.split('/')
-            
-            # Reorganizar para YYYY-MM-DD HH:MM:SS
-            iso_format = f"{year}-{month.zfill(2)}-{day.zfill(2)} {time_part}"
-            return iso_format
-        except:
-            return None
+        return None
     
     return str_value
 
@@ -3,15 +3,28 @@
 Script de importação normalizada
 - Cria/atualiza veículos na tabela veiculos
 - Insere passagens referenciando os veículos
-- Atualiza estatísticas automaticamente via triggers
+- Estratégias:
+  - two_pass: primeiro coleta todos os veículos únicos, depois insere as passagens
+    em carga em massa (staging, sem triggers nem índices, estatísticas no final)
+  - single_pass: carrega o CSV inteiro e insere veículos e passagens lote a lote,
+    com as estatísticas atualizadas via triggers
 """
 
+import csv
+import io
+import math
+import multiprocessing
+import os
+import queue
 import sys
+import threading
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import time
-import re
-from collections import defaultdict
+from datetime import datetime, timezone
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 
 # Adicionar o diretório backend ao path
 backend_dir = Path(__file__).parent.parent
@@ -20,88 +33,709 @@ sys.path.insert(0, str(backend_dir))
 from app.models.database import DatabaseConfig, get_db_connection
 import psycopg
 
-def fix_coordinate_format(value):
-    """Converte coordenadas do formato brasileiro (vírgula) para formato internacional (ponto)"""
-    if pd.isna(value) or value == '' or str(value).lower() == 'null':
-        return None
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Ordem das colunas usada no COPY de passagens
+PASSAGE_COLUMNS = (
+    'veiculo_id', 'dataHoraUTC', 'pontoCaptura', 'cidade', 'uf',
+    'codigoEquipamento', 'codigoRodovia', 'km', 'faixa', 'sentido',
+    'velocidade', 'latitude', 'longitude', 'refImagem1', 'refImagem2',
+    'sistemaOrigem', 'ehEquipamentoMovel', 'ehLeituraHumana',
+    'tipoInferidoIA', 'marcaModeloInferidoIA'
+)
+
+COPY_PASSAGENS_SQL = f"COPY passagens ({', '.join(PASSAGE_COLUMNS)}) FROM STDIN"
+
+# Tabela de staging UNLOGGED (sem WAL) que recebe o COPY; as passagens vão para a
+# tabela definitiva num único INSERT ... SELECT no final da carga
+STAGING_TABLE = 'passagens_staging'
+CREATE_STAGING_SQL = (
+    f"CREATE UNLOGGED TABLE {STAGING_TABLE} AS "
+    f"SELECT {', '.join(PASSAGE_COLUMNS)} FROM passagens WITH NO DATA"
+)
+COPY_STAGING_SQL = f"COPY {STAGING_TABLE} ({', '.join(PASSAGE_COLUMNS)}) FROM STDIN"
+COPY_STAGING_CSV_SQL = f"{COPY_STAGING_SQL} WITH (FORMAT CSV)"
+MOVE_STAGING_SQL = (
+    f"INSERT INTO passagens ({', '.join(PASSAGE_COLUMNS)}) "
+    f"SELECT {', '.join(PASSAGE_COLUMNS)} FROM {STAGING_TABLE}"
+)
+
+# Inserção de veículos em lote (arrays paralelos) devolvendo o mapa placa -> id
+# numa única ida ao servidor; ON CONFLICT garante o id de placas já existentes
+INSERT_VEICULOS_SQL = """
+    INSERT INTO veiculos (placa, marca_modelo, tipo)
+    SELECT * FROM UNNEST(%s::text[], %s::text[], %s::text[])
+    ON CONFLICT (placa) DO UPDATE SET placa = EXCLUDED.placa
+    RETURNING placa, id
+"""
+
+# Colunas de passagens por tipo de limpeza
+TEXT_COLUMNS = [
+    'pontoCaptura', 'cidade', 'uf', 'codigoEquipamento', 'codigoRodovia',
+    'sentido', 'refImagem1', 'refImagem2', 'sistemaOrigem',
+    'tipoInferidoIA', 'marcaModeloInferidoIA'
+]
+NUMERIC_COLUMNS = ['km', 'velocidade', 'latitude', 'longitude']
+BOOLEAN_COLUMNS = ['ehEquipamentoMovel', 'ehLeituraHumana']
+TRUE_VALUES = ['true', '1', 'sim', 'yes']
+BR_DATE_FORMAT = '%d/%m/%Y, %H:%M:%S'  # dia e mês podem ter um só dígito
+VEHICLE_COLUMNS = ['placa', 'marcaModeloInferidoIA', 'tipoInferidoIA']
+
+# Todas as colunas do CSV são lidas como texto: a conversão é feita na limpeza
+# (coordenadas usam vírgula decimal e datas vêm no formato brasileiro)
+CSV_DTYPES = {col: 'string' for col in ('placa',) + PASSAGE_COLUMNS[1:]}
+
+# Estratégias de importação aceitas por import_normalized_csv()
+STRATEGIES = ('two_pass', 'single_pass')
+
+# Tamanho dos blocos de leitura: limita a memória a um bloco por vez
+CHUNK_SIZE = 200_000  # linhas por bloco (engine C do pandas)
+CHUNK_BYTES = 64 * 1024 * 1024  # bytes por bloco (leitor em streaming do PyArrow)
+
+def read_passages_csv(csv_file):
+    """Lê o CSV de passagens inteiro com dtypes explícitos (engine PyArrow quando disponível)"""
+    if PYARROW_AVAILABLE:
+        return pd.read_csv(csv_file, engine='pyarrow', dtype=CSV_DTYPES, dtype_backend='pyarrow')
+    return pd.read_csv(csv_file, dtype=CSV_DTYPES)
+
+def iter_passages_csv(csv_file, usecols=None):
+    """Lê o CSV de passagens em blocos, com dtypes explícitos (PyArrow quando disponível)"""
+    if PYARROW_AVAILABLE:
+        reader = pa_csv.open_csv(
+            csv_file,
+            read_options=pa_csv.ReadOptions(block_size=CHUNK_BYTES),
+            # Campos entre aspas podem conter quebras de linha (CSV válido)
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={col: pa.string() for col in CSV_DTYPES},
+                include_columns=usecols,
+                strings_can_be_null=True
+            )
+        )
+        for batch in reader:
+            yield batch.to_pandas(types_mapper=pd.ArrowDtype)
+        return
+    
+    yield from pd.read_csv(csv_file, dtype=CSV_DTYPES, usecols=usecols, chunksize=CHUNK_SIZE)
+
+# Processos usados na leitura/limpeza paralela (a escrita no banco fica no processo principal)
+WORKERS = max(1, (os.cpu_count() or 1) - 1)
+
+# Leitura sequencial usada para achar os pontos de corte do CSV
+SPLIT_SCAN_BYTES = 4 * 1024 * 1024
+
+def split_csv_ranges(csv_file, block_bytes=CHUNK_BYTES):
+    """Divide o CSV (sem o cabeçalho) em intervalos de bytes que terminam em fim de registro;
+    quebras de linha dentro de campos entre aspas nunca são usadas como corte"""
+    with open(csv_file, 'rb') as f:
+        pos = 0            # posição absoluta do início de buf
+        in_quotes = False  # aspas abertas antes de buf (paridade; "" conta duas vezes)
+        start = None       # início do intervalo corrente (None: ainda no cabeçalho)
+        target = 0         # a primeira quebra de linha fora de aspas a partir daqui fecha o intervalo
+        
+        while True:
+            buf = f.read(SPLIT_SCAN_BYTES)
+            if not buf:
+                break
+            
+            idx, odd = 0, in_quotes  # odd = paridade das aspas em buf[:idx]
+            search = max(target - pos, 0)
+            while search < len(buf):
+                nl = buf.find(b'\n', search)
+                if nl < 0:
+                    break
+                odd ^= bool(buf.count(b'"', idx, nl) & 1)
+                idx = nl
+                if odd:
+                    search = nl + 1  # quebra de linha dentro de um campo entre aspas
+                    continue
+                
+                end = pos + nl + 1
+                if start is not None:
+                    yield start, end
+                start = end
+                target = end + block_bytes
+                search = target - pos
+            
+            in_quotes ^= bool(buf.count(b'"') & 1)
+            pos += len(buf)
+        
+        if start is not None and start < pos:
+            yield start, pos
+
+def has_quoted_newline(data):
+    """Indica se algum campo entre aspas contém quebra de linha (data começa num início de registro)"""
+    if b'"' not in data:
+        return False
+    buf = np.frombuffer(data, dtype=np.uint8)
+    quotes = np.flatnonzero(buf == ord('"'))
+    newlines = np.flatnonzero(buf == ord('\n'))
+    # Número ímpar de aspas antes da quebra de linha: ela está dentro de um campo
+    return bool((np.searchsorted(quotes, newlines) & 1).any())
+
+def clean_csv_range(csv_file, columns, start, end):
+    """Lê e limpa um intervalo de bytes do CSV (executado nos processos de trabalho)"""
+    with open(csv_file, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    
+    # Intervalo só com linhas em branco (ex.: final do arquivo)
+    if not data.strip():
+        return clean_passages(pd.DataFrame(columns=columns, dtype='string'))
     
-    str_value = str(value).strip()
+    # O engine PyArrow do pandas corta o buffer em quebras de linha sem olhar as aspas:
+    # blocos com campos de várias linhas ficam com o engine C
+    use_pyarrow = PYARROW_AVAILABLE and not has_quoted_newline(data)
+    engine_options = {'engine': 'pyarrow', 'dtype_backend': 'pyarrow'} if use_pyarrow else {}
+    chunk = pd.read_csv(io.BytesIO(data), header=None, names=columns, dtype=CSV_DTYPES, **engine_options)
+    return clean_passages(chunk)
+
+def iter_clean_blocks(csv_file):
+    """Gera blocos de passagens já limpos, processados em paralelo por WORKERS processos"""
+    columns = pd.read_csv(csv_file, nrows=0).columns.tolist()
+    ranges = split_csv_ranges(csv_file)
     
-    if ',' in str_value:
+    if WORKERS == 1:
+        for start, end in ranges:
+            yield clean_csv_range(csv_file, columns, start, end)
+        return
+    
+    # Esta função roda na thread produtora enquanto a principal mantém um COPY aberto:
+    # os processos não podem nascer de fork() (herdariam locks e o socket do banco)
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    with ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context(start_method)) as executor:
+        pending = deque()
+        for start, end in ranges:
+            pending.append(executor.submit(clean_csv_range, csv_file, columns, start, end))
+            
+            # Limitar a memória: no máximo dois blocos em andamento por processo
+            if len(pending) >= 2 * WORKERS:
+                yield pending.popleft().result()
+        
+        while pending:
+            yield pending.popleft().result()
+
+def strip_text(series):
+    """Remove espaços das bordas da coluna; só converte para texto o que ainda não é texto"""
+    if not pd.api.types.is_string_dtype(series.dtype):
+        series = series.astype('string')
+    return series.str.strip()
+
+def fix_coordinate_format(series):
+    """Converte coordenadas do formato brasileiro (vírgula) para formato internacional (ponto)"""
+    if PYARROW_AVAILABLE:
+        # Caminho rápido: kernels compilados do Arrow (troca da vírgula + conversão)
         try:
-            fixed_value = str_value.replace(',', '.')
-            return float(fixed_value)
-        except:
-            return None
+            text = pa.array(series, type=pa.string(), from_pandas=True)
+            values = pc.cast(pc.replace_substring(text, ',', '.'), pa.float64())
+            return pd.Series(pd.arrays.ArrowExtensionArray(values), index=series.index)
+        except pa.ArrowInvalid:
+            pass  # valores inválidos na coluna: usar a conversão tolerante abaixo
+    
+    text = strip_text(series).str.replace(',', '.', regex=False)
+    return pd.to_numeric(text, errors='coerce')
+
+def fix_date_format(series):
+    """Converte datas do formato brasileiro (dd/mm/aaaa, hh:mm:ss) para timestamps"""
+    text = strip_text(series)
+    dates = pd.to_datetime(text, format=BR_DATE_FORMAT, errors='coerce')
+    
+    # Só as linhas fora do formato brasileiro (ex.: já em ISO) passam pela segunda leitura;
+    # offsets diferentes no mesmo bloco são convertidos para UTC (sem fuso, como as datas brasileiras)
+    pending = dates.isna() & text.notna()
+    if pending.any():
+        iso_dates = pd.to_datetime(text[pending], format='ISO8601', errors='coerce', utc=True)
+        dates = dates.fillna(iso_dates.dt.tz_convert(None))
+    return dates
+
+def clean_passages(df):
+    """Limpa as colunas das passagens de forma vetorizada (uma operação por coluna)"""
+    clean = {
+        'placa': strip_text(df['placa']),
+        'dataHoraUTC': fix_date_format(df['dataHoraUTC']),
+        'faixa': np.trunc(pd.to_numeric(df['faixa'], errors='coerce')).astype('Int64')
+    }
+    
+    for col in TEXT_COLUMNS:
+        clean[col] = strip_text(df[col])
+    
+    for col in NUMERIC_COLUMNS:
+        clean[col] = fix_coordinate_format(df[col])
+    
+    for col in BOOLEAN_COLUMNS:
+        clean[col] = strip_text(df[col]).str.lower().isin(TRUE_VALUES)
+    
+    return pd.DataFrame(clean, index=df.index)
+
+def column_to_values(series):
+    """Converte a coluna em objetos Python, com None onde a máscara de nulos indicar NA/NaN/NaT"""
+    values = series.to_numpy(dtype=object)
+    values[series.isna().to_numpy()] = None
+    return values
+
+def dataframe_to_rows(df):
+    """Converte o DataFrame em tuplas para o COPY (uma máscara de nulos por coluna, sem testes por linha)"""
+    return zip(*(column_to_values(df[col]) for col in df.columns))
+
+def collect_unique_vehicles(csv_file):
+    """Coleta informações únicas de veículos lendo o CSV em blocos"""
+    seen_placas = set()
+    vehicles = []
+    total_rows = 0
+    
+    print("🔍 Coletando veículos únicos...")
+    
+    for chunk in iter_passages_csv(csv_file, usecols=VEHICLE_COLUMNS):
+        total_rows += len(chunk)
+        chunk_vehicles = chunk[VEHICLE_COLUMNS].apply(strip_text).dropna(subset=['placa']).drop_duplicates('placa')
+        
+        # Apenas placas ainda não vistas em blocos anteriores (primeira ocorrência vale)
+        chunk_vehicles = chunk_vehicles[~chunk_vehicles['placa'].isin(seen_placas)]
+        seen_placas.update(chunk_vehicles['placa'])
+        vehicles.extend(dataframe_to_rows(chunk_vehicles))
+    
+    print(f"✅ {len(vehicles):,} veículos únicos encontrados")
+    return vehicles, total_rows
+
+def insert_vehicles(vehicles, conn):
+    """Insere veículos únicos no banco num único INSERT e retorna o mapa placa -> id"""
+    print("🚗 Inserindo veículos no banco...")
+    
+    with conn.cursor() as cur:
+        # Um array por coluna: placa, marca/modelo, tipo
+        arrays = [list(col) for col in zip(*vehicles)] or [[], [], []]
+        cur.execute(INSERT_VEICULOS_SQL, arrays)
+        vehicles_dict_db = dict(cur.fetchall())
+        
+        conn.commit()
+    
+    print(f"✅ {len(vehicles):,} veículos inseridos")
+    return vehicles_dict_db
+
+# Índices secundários de passagens (ver create_normalized_structure.py),
+# removidos durante a carga e recriados uma única vez no final
+PASSAGENS_INDEXES = {
+    'idx_passagens_veiculo_id': "CREATE INDEX idx_passagens_veiculo_id ON passagens(veiculo_id)",
+    'idx_passagens_dataHoraUTC': "CREATE INDEX idx_passagens_dataHoraUTC ON passagens(dataHoraUTC)",
+    'idx_passagens_cidade': "CREATE INDEX idx_passagens_cidade ON passagens(cidade)",
+    'idx_passagens_uf': "CREATE INDEX idx_passagens_uf ON passagens(uf)",
+    'idx_passagens_codigoRodovia': "CREATE INDEX idx_passagens_codigoRodovia ON passagens(codigoRodovia)",
+    'idx_passagens_codigoEquipamento': "CREATE INDEX idx_passagens_codigoEquipamento ON passagens(codigoEquipamento)",
+    'idx_passagens_sistemaOrigem': "CREATE INDEX idx_passagens_sistemaOrigem ON passagens(sistemaOrigem)",
+    'idx_passagens_placa_data': "CREATE INDEX idx_passagens_placa_data ON passagens(veiculo_id, dataHoraUTC)",
+    'idx_passagens_coordenadas': (
+        "CREATE INDEX idx_passagens_coordenadas ON passagens(latitude, longitude) "
+        "WHERE latitude IS NOT NULL AND longitude IS NOT NULL"
+    ),
+}
+
+# Recalcula as estatísticas de todos os veículos numa única passada,
+# substituindo o trigger por linha desativado durante a carga
+UPDATE_VEHICLE_STATS_SQL = """
+    UPDATE veiculos v SET
+        primeira_passagem = s.primeira,
+        ultima_passagem = s.ultima,
+        total_passagens = s.total,
+        cidades_visitadas = s.cidades,
+        ufs_visitadas = s.ufs,
+        sistemas_origem = s.sistemas,
+        atualizado_em = CURRENT_TIMESTAMP
+    FROM (
+        SELECT
+            veiculo_id,
+            MIN(dataHoraUTC) AS primeira,
+            MAX(dataHoraUTC) AS ultima,
+            COUNT(*) AS total,
+            ARRAY_AGG(DISTINCT cidade) FILTER (WHERE cidade IS NOT NULL) AS cidades,
+            ARRAY_AGG(DISTINCT uf) FILTER (WHERE uf IS NOT NULL) AS ufs,
+            ARRAY_AGG(DISTINCT sistemaOrigem) FILTER (WHERE sistemaOrigem IS NOT NULL) AS sistemas
+        FROM passagens
+        GROUP BY veiculo_id
+    ) s
+    WHERE v.id = s.veiculo_id
+"""
+
+def prepare_bulk_load(conn):
+    """Desativa triggers/FKs, remove índices de passagens e cria a tabela de staging"""
+    print("⚙️ Preparando carga em massa (triggers desativados, índices removidos)...")
+    
+    with conn.cursor() as cur:
+        # Configurações da sessão, válidas para toda a carga:
+        # blocos grandes de COPY podem passar do timeout padrão da conexão, e os dados
+        # podem ser recarregados do CSV, então não é preciso esperar o flush do WAL
+        cur.execute("SET statement_timeout = 0")
+        cur.execute("SET synchronous_commit = off")
+        
+        cur.execute("ALTER TABLE passagens DISABLE TRIGGER ALL")
+        for index_name in PASSAGENS_INDEXES:
+            cur.execute(f"DROP INDEX IF EXISTS {index_name}")
+        
+        # Staging de uma carga anterior interrompida é descartado
+        cur.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        cur.execute(CREATE_STAGING_SQL)
+        conn.commit()
+
+def finish_bulk_load(conn):
+    """Move o staging para passagens, recria índices, recalcula estatísticas e reativa triggers"""
+    print("⚙️ Finalizando carga em massa (staging, índices, estatísticas, triggers)...")
     
+    # Descartar uma transação abortada por falha na carga
+    conn.rollback()
+    
+    with conn.cursor() as cur:
+        cur.execute("SET maintenance_work_mem = '1GB'")
+        
+        cur.execute(MOVE_STAGING_SQL)
+        cur.execute(f"DROP TABLE {STAGING_TABLE}")
+        
+        for create_sql in PASSAGENS_INDEXES.values():
+            cur.execute(create_sql)
+        
+        cur.execute(UPDATE_VEHICLE_STATS_SQL)
+        cur.execute("ALTER TABLE passagens ENABLE TRIGGER ALL")
+        cur.execute("ANALYZE passagens")
+        cur.execute("ANALYZE veiculos")
+        conn.commit()
+
+# Blocos prontos aguardando o COPY (limita a memória a poucos blocos)
+COPY_QUEUE_SIZE = 4
+
+def produce_copy_blocks(csv_file, vehicles_dict_db, blocks):
+    """Produtor: limpa e valida os blocos, resolve veiculo_id e enfileira as tuplas prontas para o COPY"""
     try:
-        return float(str_value)
-    except:
-        return None
+        for batch_df in iter_clean_blocks(csv_file):
+            if batch_df.empty:
+                continue
+            batch_df['veiculo_id'] = batch_df['placa'].map(vehicles_dict_db).astype('Int64')
+            
+            # Validação vetorizada: placa desconhecida ou data inválida
+            valid = batch_df['veiculo_id'].notna() & batch_df['dataHoraUTC'].notna()
+            errors = int((~valid).sum())
+            rows = list(dataframe_to_rows(batch_df.loc[valid, list(PASSAGE_COLUMNS)]))
+            blocks.put((rows, errors, len(batch_df)))
+    except Exception as e:
+        blocks.put(e)
+    else:
+        blocks.put(None)  # fim do arquivo
 
-def fix_date_format(value):
-    """Converte data do formato brasileiro para formato ISO"""
-    if pd.isna(value) or value == '' or str(value).lower() == 'null':
-        return None
+def insert_passages(csv_file, vehicles_dict_db, conn):
+    """Insere passagens no banco, sobrepondo a limpeza dos blocos (thread produtora) ao COPY"""
+    print("📋 Inserindo passagens no banco...")
     
-    str_value = str(value).strip()
+    total_passages = 0
+    total_errors = 0
+    rows_read = 0
+    
+    blocks = queue.Queue(maxsize=COPY_QUEUE_SIZE)
+    # daemon: se o COPY falhar, a thread produtora não impede o encerramento do script
+    producer = threading.Thread(
+        target=produce_copy_blocks,
+        args=(csv_file, vehicles_dict_db, blocks),
+        daemon=True
+    )
+    producer.start()
+    
+    with conn.cursor() as cur:
+        for chunk_number, block in enumerate(iter(blocks.get, None), 1):
+            if isinstance(block, Exception):
+                raise block
+            rows, batch_errors, block_rows = block
+            
+            print(f"📦 Processando lote {chunk_number} (linhas {rows_read+1}-{rows_read+block_rows})")
+            rows_read += block_rows
+            
+            # Linhas já validadas: nenhum teste dentro do laço do COPY
+            with cur.copy(COPY_STAGING_SQL) as copy:
+                for row in rows:
+                    copy.write_row(row)
+            batch_passages = len(rows)
+            
+            # Um commit por bloco, sempre na mesma conexão
+            conn.commit()
+            total_passages += batch_passages
+            total_errors += batch_errors
+            
+            print(f"   ✅ Lote: {batch_passages} passagens, {batch_errors} erros")
     
-    if '/' in str_value and ',' in str_value:
+    producer.join()
+    return total_passages, total_errors
+
+# Caminho sem pandas: csv.reader -> transformação por linha -> COPY em formato CSV
+
+NULL_VALUES = {'', 'null', 'nan'}
+TRUE_VALUES_SET = set(TRUE_VALUES)
+
+# Linhas acumuladas antes de cada escrita no COPY
+CSV_WRITE_ROWS = 10_000
+
+def _csv_text(value):
+    """Texto sem espaços nas bordas, ou None para valores vazios/nulos"""
+    value = value.strip()
+    return None if value.lower() in NULL_VALUES else value
+
+# Faixa é INTEGER no banco: fora desse intervalo o COPY falharia
+INT4_MIN, INT4_MAX = -2**31, 2**31 - 1
+
+def _csv_float(value):
+    """(texto com ponto decimal, float) de um número com vírgula decimal; None se inválido"""
+    value = _csv_text(value)
+    # float() aceita '1_000', que o PostgreSQL rejeita
+    if value is None or '_' in value:
+        return None
+    value = value.replace(',', '.')
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    # inf/nan não cabem nas colunas numéricas
+    if not math.isfinite(number):
+        return None
+    return value, number
+
+def _csv_number(value):
+    """Número com vírgula decimal convertido para ponto (None se inválido)"""
+    parsed = _csv_float(value)
+    return parsed[0] if parsed else None
+
+def _csv_int(value):
+    """Número truncado para inteiro, como o np.trunc do caminho pandas (None se inválido)"""
+    parsed = _csv_float(value)
+    if not parsed:
+        return None
+    number = math.trunc(parsed[1])
+    return number if INT4_MIN <= number <= INT4_MAX else None
+
+def _csv_date(value):
+    """Data brasileira (ou ISO) validada e reescrita em ISO; None se não for uma data válida"""
+    value = _csv_text(value)
+    if value is None:
+        return None
+    try:
+        date = datetime.strptime(value, BR_DATE_FORMAT)
+    except ValueError:
+        # Mesmo fallback do fix_date_format: valores já em ISO 8601
         try:
-            date_part, time_part = str_value.split(', ')
-            day, month, year = date_part.split('/')
-            iso_format = f"{year}-{month.zfill(2)}-{day.zfill(2)} {time_part}"
-            return iso_format
-        except:
+            date = datetime.fromisoformat(value)
+        except ValueError:
             return None
+        if date.tzinfo is not None:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+    return date.isoformat(sep=' ')
+
+def collect_unique_vehicles_csv(csv_file):
+    """Coleta veículos únicos com csv.reader, sem DataFrames"""
+    seen_placas = set()
+    vehicles = []
+    total_rows = 0
+    
+    print("🔍 Coletando veículos únicos (sem pandas)...")
     
-    return str_value
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        i_placa, i_marca, i_tipo = (header.index(col) for col in VEHICLE_COLUMNS)
+        
+        for row in reader:
+            if not row:
+                continue
+            total_rows += 1
+            placa = _csv_text(row[i_placa])
+            if placa is None or placa in seen_placas:
+                continue
+            seen_placas.add(placa)
+            vehicles.append((placa, _csv_text(row[i_marca]), _csv_text(row[i_tipo])))
+    
+    print(f"✅ {len(vehicles):,} veículos únicos encontrados")
+    return vehicles, total_rows
 
-def extract_vehicle_info(row):
-    """Extrai informações do veículo da linha"""
-    vehicle_info = {
-        'placa': str(row['placa']).strip() if pd.notna(row['placa']) else None
-    }
+def insert_passages_csv(csv_file, vehicles_dict_db, conn):
+    """Insere passagens lendo o CSV linha a linha e escrevendo direto num COPY em formato CSV"""
+    print("📋 Inserindo passagens no banco (sem pandas)...")
     
-    # Tentar extrair marca/modelo de campos disponíveis
-    if 'marcaModeloInferidoIA' in row and pd.notna(row['marcaModeloInferidoIA']):
-        vehicle_info['marca_modelo'] = str(row['marcaModeloInferidoIA']).strip()
-    elif 'tipoInferidoIA' in row and pd.notna(row['tipoInferidoIA']):
-        vehicle_info['tipo'] = str(row['tipoInferidoIA']).strip()
-    
-    return vehicle_info
-
-def extract_passage_info(row, veiculo_id):
-    """Extrai informações da passagem da linha"""
-    passage_info = {
-        'veiculo_id': veiculo_id,
-        'dataHoraUTC': fix_date_format(row['dataHoraUTC']),
-        'pontoCaptura': str(row['pontoCaptura']).strip() if pd.notna(row['pontoCaptura']) else None,
-        'cidade': str(row['cidade']).strip() if pd.notna(row['cidade']) else None,
-        'uf': str(row['uf']).strip() if pd.notna(row['uf']) else None,
-        'codigoEquipamento': str(row['codigoEquipamento']).strip() if pd.notna(row['codigoEquipamento']) else None,
-        'codigoRodovia': str(row['codigoRodovia']).strip() if pd.notna(row['codigoRodovia']) else None,
-        'km': fix_coordinate_format(row['km']),
-        'faixa': int(float(row['faixa'])) if pd.notna(row['faixa']) else None,
-        'sentido': str(row['sentido']).strip() if pd.notna(row['sentido']) else None,
-        'velocidade': fix_coordinate_format(row['velocidade']),
-        'latitude': fix_coordinate_format(row['latitude']),
-        'longitude': fix_coordinate_format(row['longitude']),
-        'refImagem1': str(row['refImagem1']).strip() if pd.notna(row['refImagem1']) else None,
-        'refImagem2': str(row['refImagem2']).strip() if pd.notna(row['refImagem2']) else None,
-        'sistemaOrigem': str(row['sistemaOrigem']).strip() if pd.notna(row['sistemaOrigem']) else None,
-        'ehEquipamentoMovel': str(row['ehEquipamentoMovel']).lower() in ['true', '1', 'sim', 'yes'] if pd.notna(row['ehEquipamentoMovel']) else False,
-        'ehLeituraHumana': str(row['ehLeituraHumana']).lower() in ['true', '1', 'sim', 'yes'] if pd.notna(row['ehLeituraHumana']) else False,
-        'tipoInferidoIA': str(row['tipoInferidoIA']).strip() if pd.notna(row['tipoInferidoIA']) else None,
-        'marcaModeloInferidoIA': str(row['marcaModeloInferidoIA']).strip() if pd.notna(row['marcaModeloInferidoIA']) else None
-    }
+    total_passages = 0
+    total_errors = 0
+    
+    with open(csv_file, newline='', encoding='utf-8') as f, conn.cursor() as cur:
+        reader = csv.reader(f)
+        header = next(reader)
+        index = {col: header.index(col) for col in CSV_DTYPES}
+        i_placa, i_data, i_faixa = index['placa'], index['dataHoraUTC'], index['faixa']
+        text_idx = [index[col] for col in TEXT_COLUMNS]
+        i_ponto, i_cidade, i_uf, i_equip, i_rodovia, i_sentido, i_img1, i_img2, i_sistema, i_tipo, i_marca = text_idx
+        i_km, i_vel, i_lat, i_lon = (index[col] for col in NUMERIC_COLUMNS)
+        i_movel, i_humana = (index[col] for col in BOOLEAN_COLUMNS)
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        
+        with cur.copy(COPY_STAGING_CSV_SQL) as copy:
+            for row in reader:
+                if not row:
+                    continue
+                
+                veiculo_id = vehicles_dict_db.get(row[i_placa].strip())
+                data = _csv_date(row[i_data])
+                if veiculo_id is None or data is None:
+                    total_errors += 1
+                    continue
+                
+                # Mesma ordem de PASSAGE_COLUMNS; None vira campo vazio (NULL no COPY CSV)
+                writer.writerow((
+                    veiculo_id, data,
+                    _csv_text(row[i_ponto]), _csv_text(row[i_cidade]), _csv_text(row[i_uf]),
+                    _csv_text(row[i_equip]), _csv_text(row[i_rodovia]),
+                    _csv_number(row[i_km]), _csv_int(row[i_faixa]),
+                    _csv_text(row[i_sentido]),
+                    _csv_number(row[i_vel]), _csv_number(row[i_lat]), _csv_number(row[i_lon]),
+                    _csv_text(row[i_img1]), _csv_text(row[i_img2]), _csv_text(row[i_sistema]),
+                    row[i_movel].strip().lower() in TRUE_VALUES_SET,
+                    row[i_humana].strip().lower() in TRUE_VALUES_SET,
+                    _csv_text(row[i_tipo]), _csv_text(row[i_marca])
+                ))
+                total_passages += 1
+                
+                if total_passages % CSV_WRITE_ROWS == 0:
+                    copy.write(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+            
+            copy.write(buffer.getvalue())
+        
+        conn.commit()
+    
+    print(f"   ✅ {total_passages:,} passagens, {total_errors:,} erros")
+    return total_passages, total_errors
+
+# Lotes da estratégia single_pass: cada lote é um único COPY e um único commit
+SINGLE_PASS_BATCH_SIZE = 10_000
+
+def insert_batches(df, conn):
+    """Insere veículos e passagens lote a lote (estratégia single_pass, triggers ativos)"""
+    total_vehicles = 0
+    total_passages = 0
+    total_errors = 0
+    
+    # Dicionário placa -> id dos veículos já inseridos
+    vehicles_dict = {}
+    
+    with conn.cursor() as cur:
+        for batch_start in range(0, len(df), SINGLE_PASS_BATCH_SIZE):
+            batch_end = min(batch_start + SINGLE_PASS_BATCH_SIZE, len(df))
+            batch_df = clean_passages(df.iloc[batch_start:batch_end])
+            
+            print(f"📦 Processando lote {batch_start//SINGLE_PASS_BATCH_SIZE + 1} (linhas {batch_start+1}-{batch_end})")
+            
+            batch_vehicles = 0
+            
+            # Veículos ainda não inseridos (marca/modelo tem prioridade sobre o tipo)
+            vehicles = batch_df[VEHICLE_COLUMNS].dropna(subset=['placa']).drop_duplicates('placa')
+            vehicles = vehicles[~vehicles['placa'].isin(vehicles_dict.keys())]
+            vehicles = vehicles.assign(
+                tipoInferidoIA=vehicles['tipoInferidoIA'].where(vehicles['marcaModeloInferidoIA'].isna())
+            )
+            new_vehicles = list(dataframe_to_rows(vehicles))
+            
+            # Inserir veículos novos e recuperar os ids na mesma instrução
+            if new_vehicles:
+                # Um array por coluna: placa, marca/modelo, tipo; a instrução se repete
+                # a cada lote, então o servidor a prepara uma vez e reutiliza o plano
+                arrays = [list(col) for col in zip(*new_vehicles)]
+                cur.execute(INSERT_VEICULOS_SQL, arrays, prepare=True)
+                vehicles_dict.update(cur.fetchall())
+                batch_vehicles = len(new_vehicles)
+            
+            batch_df['veiculo_id'] = batch_df['placa'].map(vehicles_dict).astype('Int64')
+            
+            # Validação vetorizada: placa ausente ou data inválida
+            valid = batch_df['veiculo_id'].notna() & batch_df['dataHoraUTC'].notna()
+            batch_errors = int((~valid).sum())
+            
+            # Inserir passagens via COPY (linhas já validadas, na ordem de PASSAGE_COLUMNS)
+            batch_passages = 0
+            with cur.copy(COPY_PASSAGENS_SQL) as copy:
+                for row in dataframe_to_rows(batch_df.loc[valid, list(PASSAGE_COLUMNS)]):
+                    copy.write_row(row)
+                    batch_passages += 1
+            
+            # Commit do lote
+            conn.commit()
+            total_vehicles += batch_vehicles
+            total_passages += batch_passages
+            total_errors += batch_errors
+            
+            print(f"   ✅ Lote: {batch_vehicles} veículos, {batch_passages} passagens, {batch_errors} erros")
     
-    return passage_info
+    return total_vehicles, total_passages, total_errors
 
-def import_normalized_csv(csv_file):
-    """Importa CSV com estrutura normalizada"""
+VERIFY_SQL = """
+    WITH stats AS (
+        SELECT COUNT(*) AS total, AVG(total_passagens) AS media, MAX(total_passagens) AS maximo
+        FROM veiculos
+    ), top5 AS (
+        SELECT placa, total_passagens,
+               COALESCE(cardinality(cidades_visitadas), 0) AS cidades,
+               COALESCE(cardinality(ufs_visitadas), 0) AS ufs
+        FROM veiculos
+        ORDER BY total_passagens DESC NULLS LAST
+        LIMIT 5
+    )
+    SELECT
+        s.total,
+        (SELECT COUNT(*) FROM passagens),
+        s.media,
+        s.maximo,
+        (SELECT COUNT(DISTINCT c.cidade) FROM veiculos v CROSS JOIN LATERAL unnest(v.cidades_visitadas) AS c(cidade)),
+        (SELECT COUNT(DISTINCT u.uf) FROM veiculos v CROSS JOIN LATERAL unnest(v.ufs_visitadas) AS u(uf)),
+        (SELECT COALESCE(json_agg(t ORDER BY t.total_passagens DESC NULLS LAST), '[]'::json) FROM top5 t)
+    FROM stats s
+"""
+
+def print_database_summary(conn):
+    """Mostra contagens, estatísticas e top 5 veículos com uma única consulta"""
+    print(f"\n🔍 Verificando dados no banco...")
+    with conn.cursor() as cur:
+        cur.execute(VERIFY_SQL)
+        (vehicles_count, passages_count, avg_passages, max_passages,
+         unique_cities, unique_ufs, top_vehicles) = cur.fetchone()
+    
+    print(f"📊 Dados no banco:")
+    print(f"   🚗 Veículos: {vehicles_count:,}")
+    print(f"   📋 Passagens: {passages_count:,}")
+    print(f"   📈 Média de passagens por veículo: {(avg_passages or 0):.1f}")
+    print(f"   🏆 Máximo de passagens: {max_passages}")
+    print(f"   🏙️ Cidades únicas visitadas: {unique_cities}")
+    print(f"   🗺️ UFs únicas visitadas: {unique_ufs}")
+    
+    # json_agg chega já decodificado pelo psycopg (lista de dicts)
+    print(f"\n🏆 Top 5 veículos com mais passagens:")
+    for i, vehicle in enumerate(top_vehicles, 1):
+        print(f"   {i}. {vehicle['placa']} - {vehicle['total_passagens']} passagens")
+        print(f"      Cidades: {vehicle['cidades']}, UFs: {vehicle['ufs']}")
+
+def import_normalized_csv(csv_file, strategy='two_pass', use_pandas=True):
+    """Importa CSV com estrutura normalizada
+    
+    Args:
+        csv_file: Caminho do arquivo CSV
+        strategy: 'two_pass' (veículos primeiro, carga em massa) ou 'single_pass' (lotes com triggers)
+        use_pandas: False usa o caminho csv.reader -> COPY, sem DataFrames (apenas two_pass)
+    """
+    
+    if strategy not in STRATEGIES:
+        print(f"❌ Estratégia inválida: {strategy} (use {' ou '.join(STRATEGIES)})")
+        return False
+    
+    if strategy == 'single_pass' and not use_pandas:
+        print("❌ O caminho sem pandas só está disponível na estratégia two_pass")
+        return False
     
-    print(f"📥 Importando CSV normalizado: {csv_file}")
+    print(f"📥 Importando CSV normalizado ({strategy}): {csv_file}")
     
     if not Path(csv_file).exists():
         print(f"❌ Arquivo não encontrado: {csv_file}")
@@ -119,179 +753,80 @@ def import_normalized_csv(csv_file):
     )
     
     try:
-        # Ler CSV
         print("📊 Lendo arquivo CSV...")
-        df = pd.read_csv(csv_file, low_memory=False)
-        print(f"✅ {len(df):,} linhas carregadas")
+        if strategy == 'single_pass':
+            # CSV inteiro em memória
+            df = read_passages_csv(csv_file)
+            columns = df.columns
+            total_rows = len(df)
+        else:
+            # Passo 1: Coletar veículos únicos (primeira leitura em blocos; do resto, só o cabeçalho)
+            columns = pd.read_csv(csv_file, nrows=0).columns
+            if use_pandas:
+                vehicles, total_rows = collect_unique_vehicles(csv_file)
+            else:
+                vehicles, total_rows = collect_unique_vehicles_csv(csv_file)
+        print(f"✅ {total_rows:,} linhas lidas")
         
         # Mostrar colunas
         print(f"\n📋 Colunas encontradas:")
-        for i, col in enumerate(df.columns, 1):
+        for i, col in enumerate(columns, 1):
             print(f"   {i:2d}. {col}")
         
-        # Mostrar primeiras linhas
-        print(f"\n📊 Primeiras 3 linhas:")
-        print(df.head(3).to_string())
+        if strategy == 'single_pass':
+            # Mostrar primeiras linhas
+            print(f"\n📊 Primeiras 3 linhas:")
+            print(df.head(3).to_string())
         
         # Perguntar se deve continuar
-        resposta = input(f"\nDeseja importar {len(df):,} linhas com estrutura normalizada? (s/n): ").lower().strip()
+        resposta = input(f"\nDeseja importar {total_rows:,} linhas com estrutura normalizada? (s/n): ").lower().strip()
         if resposta not in ['s', 'sim', 'y', 'yes']:
             print("❌ Importação cancelada")
             return False
         
-        # Limpar dados existentes
-        print("🧹 Limpando dados existentes...")
+        # Uma única conexão para toda a importação
         with get_db_connection(db_config) as conn:
+            # Limpar dados existentes
+            print("🧹 Limpando dados existentes...")
             with conn.cursor() as cur:
-                cur.execute("DELETE FROM passagens")
-                cur.execute("DELETE FROM veiculos")
+                # TRUNCATE é só metadado: não varre as linhas nem gera WAL por linha, e reinicia os ids
+                cur.execute("TRUNCATE passagens, veiculos RESTART IDENTITY CASCADE")
                 conn.commit()
                 print("✅ Dados limpos!")
-        
-        # Processar dados em lotes
-        print("🔄 Processando dados em lotes...")
-        start_time = time.time()
-        
-        batch_size = 100
-        total_vehicles = 0
-        total_passages = 0
-        total_errors = 0
-        
-        # Dicionário para armazenar veículos únicos
-        vehicles_dict = {}
-        
-        for batch_start in range(0, len(df), batch_size):
-            batch_end = min(batch_start + batch_size, len(df))
-            batch_df = df.iloc[batch_start:batch_end]
             
-            print(f"📦 Processando lote {batch_start//batch_size + 1} (linhas {batch_start+1}-{batch_end})")
+            start_time = time.time()
             
-            with get_db_connection(db_config) as conn:
-                with conn.cursor() as cur:
-                    batch_vehicles = 0
-                    batch_passages = 0
-                    batch_errors = 0
-                    
-                    for index, row in batch_df.iterrows():
-                        try:
-                            # Extrair informações do veículo
-                            vehicle_info = extract_vehicle_info(row)
-                            
-                            if not vehicle_info['placa'] or vehicle_info['placa'] == 'nan':
-                                batch_errors += 1
-                                continue
-                            
-                            # Verificar se veículo já existe no dicionário
-                            placa = vehicle_info['placa']
-                            if placa not in vehicles_dict:
-                                # Inserir veículo
-                                vehicle_columns = list(vehicle_info.keys())
-                                vehicle_values = list(vehicle_info.values())
-                                vehicle_placeholders = ', '.join(['%s'] * len(vehicle_values))
-                                
-                                vehicle_sql = f"""
-                                    INSERT INTO veiculos ({', '.join(vehicle_columns)})
-                                    VALUES ({vehicle_placeholders})
-                                    RETURNING id
-                                """
-                                
-                                cur.execute(vehicle_sql, vehicle_values)
-                                veiculo_id = cur.fetchone()[0]
-                                vehicles_dict[placa] = veiculo_id
-                                batch_vehicles += 1
-                            else:
-                                veiculo_id = vehicles_dict[placa]
-                            
-                            # Extrair informações da passagem
-                            passage_info = extract_passage_info(row, veiculo_id)
-                            
-                            if not passage_info['dataHoraUTC']:
-                                batch_errors += 1
-                                continue
-                            
-                            # Inserir passagem
-                            passage_columns = list(passage_info.keys())
-                            passage_values = list(passage_info.values())
-                            passage_placeholders = ', '.join(['%s'] * len(passage_values))
-                            
-                            passage_sql = f"""
-                                INSERT INTO passagens ({', '.join(passage_columns)})
-                                VALUES ({passage_placeholders})
-                            """
-                            
-                            cur.execute(passage_sql, passage_values)
-                            batch_passages += 1
-                            
-                        except Exception as e:
-                            batch_errors += 1
-                            if batch_errors <= 3:
-                                print(f"   ⚠️ Erro na linha {index + 1}: {e}")
-                            continue
-                    
-                    # Commit do lote
-                    conn.commit()
-                    total_vehicles += batch_vehicles
-                    total_passages += batch_passages
-                    total_errors += batch_errors
-                    
-                    print(f"   ✅ Lote: {batch_vehicles} veículos, {batch_passages} passagens, {batch_errors} erros")
-        
-        total_time = time.time() - start_time
-        
-        print(f"\n✅ Importação normalizada concluída!")
-        print(f"📊 Estatísticas finais:")
-        print(f"   🚗 Veículos únicos: {total_vehicles:,}")
-        print(f"   📋 Passagens: {total_passages:,}")
-        print(f"   ❌ Erros: {total_errors:,}")
-        print(f"   📈 Sucesso: {(total_passages/(total_passages+total_errors)*100):.1f}%")
-        print(f"   ⏱️ Tempo: {total_time:.1f} segundos")
-        print(f"   🚀 Velocidade: {total_passages/total_time:.0f} passagens/segundo")
-        
-        # Verificar dados no banco
-        print(f"\n🔍 Verificando dados no banco...")
-        with get_db_connection(db_config) as conn:
-            with conn.cursor() as cur:
-                # Contar veículos
-                cur.execute("SELECT COUNT(*) FROM veiculos")
-                vehicles_count = cur.fetchone()[0]
+            if strategy == 'single_pass':
+                print("🔄 Processando dados em lotes...")
+                total_vehicles, total_passages, total_errors = insert_batches(df, conn)
+            else:
+                # Passo 2: Inserir veículos
+                vehicles_dict_db = insert_vehicles(vehicles, conn)
+                total_vehicles = len(vehicles_dict_db)
                 
-                # Contar passagens
-                cur.execute("SELECT COUNT(*) FROM passagens")
-                passages_count = cur.fetchone()[0]
-                
-                # Estatísticas dos veículos
-                cur.execute("""
-                    SELECT 
-                        COUNT(*) as total_veiculos,
-                        AVG(total_passagens) as media_passagens,
-                        MAX(total_passagens) as max_passagens,
-                        COUNT(DISTINCT unnest(cidades_visitadas)) as cidades_unicas,
-                        COUNT(DISTINCT unnest(ufs_visitadas)) as ufs_unicas
-                    FROM veiculos
-                """)
-                stats = cur.fetchone()
-                
-                print(f"📊 Dados no banco:")
-                print(f"   🚗 Veículos: {vehicles_count:,}")
-                print(f"   📋 Passagens: {passages_count:,}")
-                print(f"   📈 Média de passagens por veículo: {stats[1]:.1f}")
-                print(f"   🏆 Máximo de passagens: {stats[2]}")
-                print(f"   🏙️ Cidades únicas visitadas: {stats[3]}")
-                print(f"   🗺️ UFs únicas visitadas: {stats[4]}")
-                
-                # Mostrar alguns veículos com mais passagens
-                cur.execute("""
-                    SELECT placa, total_passagens, cidades_visitadas, ufs_visitadas
-                    FROM veiculos 
-                    ORDER BY total_passagens DESC 
-                    LIMIT 5
-                """)
-                top_vehicles = cur.fetchall()
-                
-                print(f"\n🏆 Top 5 veículos com mais passagens:")
-                for i, vehicle in enumerate(top_vehicles, 1):
-                    print(f"   {i}. {vehicle[0]} - {vehicle[1]} passagens")
-                    print(f"      Cidades: {len(vehicle[2]) if vehicle[2] else 0}, UFs: {len(vehicle[3]) if vehicle[3] else 0}")
+                # Passo 3: Inserir passagens (segunda leitura, em paralelo) sem triggers nem índices
+                prepare_bulk_load(conn)
+                try:
+                    if use_pandas:
+                        total_passages, total_errors = insert_passages(csv_file, vehicles_dict_db, conn)
+                    else:
+                        total_passages, total_errors = insert_passages_csv(csv_file, vehicles_dict_db, conn)
+                finally:
+                    finish_bulk_load(conn)
+            
+            total_time = time.time() - start_time
+            
+            print(f"\n✅ Importação normalizada concluída!")
+            print(f"📊 Estatísticas finais:")
+            print(f"   🚗 Veículos únicos: {total_vehicles:,}")
+            print(f"   📋 Passagens: {total_passages:,}")
+            print(f"   ❌ Erros: {total_errors:,}")
+            print(f"   📈 Sucesso: {(total_passages/(total_passages+total_errors)*100):.1f}%")
+            print(f"   ⏱️ Tempo: {total_time:.1f} segundos")
+            print(f"   🚀 Velocidade: {total_passages/total_time:.0f} passagens/segundo")
+            
+            # Verificar dados no banco (uma única ida ao servidor)
+            print_database_summary(conn)
         
         return True
                 
@@ -301,16 +836,24 @@ def import_normalized_csv(csv_file):
 
 def main():
     """Função principal"""
-    if len(sys.argv) != 2:
-        print("Uso: python import_normalized.py <caminho_para_seu_arquivo.csv>")
+    args = sys.argv[1:]
+    use_pandas = '--sem-pandas' not in args
+    strategy = 'single_pass'
+    for arg in args:
+        if arg.startswith('--estrategia='):
+            strategy = arg.split('=', 1)[1]
+    args = [arg for arg in args if not arg.startswith('--')]
+    
+    if len(args) != 1:
+        print("Uso: python import_normalized.py <caminho_para_seu_arquivo.csv> [--estrategia=single_pass|two_pass] [--sem-pandas]")
         print("\nExemplos:")
         print("  python import_normalized.py C:\\Users\\Usuario\\Desktop\\dados.csv")
         print("  python import_normalized.py dados/passagens.csv")
+        print("  python import_normalized.py dados/passagens.csv --estrategia=two_pass --sem-pandas")
         sys.exit(1)
     
-    csv_file = sys.argv[1]
-    import_normalized_csv(csv_file)
+    csv_file = args[0]
+    import_normalized_csv(csv_file, strategy=strategy, use_pandas=use_pandas)
 
 if __name__ == "__main__":
     main()
-
@@ -3,11 +3,15 @@
 Script robusto para importar CSV com tratamento correto de dados
 """
 
+import logging
+import os
 import sys
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import time
 import re
+from dataclasses import replace
 
 # Adicionar o diretório backend ao path
 backend_dir = Path(__file__).parent.parent
@@ -16,60 +20,192 @@ sys.path.insert(0, str(backend_dir))
 from app.models.database import DatabaseConfig, get_db_connection
 import psycopg
 
-def fix_coordinate_format(value):
-    """Converte coordenadas do formato brasileiro (vírgula) para formato internacional (ponto)"""
-    if pd.isna(value) or value == '' or str(value).lower() == 'null':
-        return None
-    
-    # Converter para string
-    str_value = str(value).strip()
+# Conversão de datas compartilhada com a importação normalizada (BR ou ISO 8601, em UTC)
+from import_normalized import fix_date_format
+
+# Configurar logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Colunas de passagens na ordem da tabela (ver create_simple_db.py)
+PASSAGE_COLUMNS = (
+    'dataHoraUTC', 'placa', 'pontoCaptura', 'cidade', 'uf',
+    'codigoEquipamento', 'codigoRodovia', 'km', 'faixa', 'sentido',
+    'velocidade', 'latitude', 'longitude', 'refImagem1', 'refImagem2',
+    'sistemaOrigem', 'ehEquipamentoMovel', 'ehLeituraHumana',
+    'tipoInferidoIA', 'marcaModeloInferidoIA'
+)
+
+# Nomes alternativos aceitos no cabeçalho do CSV (usados só quando a coluna padrão não existe)
+COLUMN_ALIASES = {
+    'datahora': 'dataHoraUTC', 'timestamp': 'dataHoraUTC',
+    'plate': 'placa', 'ponto': 'pontoCaptura', 'city': 'cidade', 'estado': 'uf',
+    'equipamento': 'codigoEquipamento', 'rodovia': 'codigoRodovia', 'quilometro': 'km',
+    'lane': 'faixa', 'direction': 'sentido', 'speed': 'velocidade',
+    'lat': 'latitude', 'lng': 'longitude', 'imagem1': 'refImagem1', 'imagem2': 'refImagem2',
+    'origem': 'sistemaOrigem', 'equipamento_movel': 'ehEquipamentoMovel',
+    'leitura_humana': 'ehLeituraHumana', 'tipo_ia': 'tipoInferidoIA',
+    'marca_modelo_ia': 'marcaModeloInferidoIA'
+}
+
+# No COPY todas as colunas são enviadas: os booleanos ausentes recebem
+# o mesmo valor do DEFAULT da tabela (os demais campos ficam NULL)
+COPY_DEFAULTS = {'ehEquipamentoMovel': False, 'ehLeituraHumana': False}
+
+# Tamanho dos blocos de leitura: cada bloco é limpo, enviado num COPY e descartado
+CHUNK_SIZE = 50_000  # linhas por bloco (engine C do pandas)
+CHUNK_BYTES = 16 * 1024 * 1024  # bytes por bloco (leitor em streaming do PyArrow, ~50 mil linhas)
+
+# Progresso registrado a cada N lotes (o detalhe de cada lote fica em DEBUG)
+PROGRESS_EVERY = 10
+
+# Colunas numéricas convertidas de uma vez por bloco
+NUMERIC_COLUMNS = ['latitude', 'longitude', 'km', 'velocidade']
+TEXT_COLUMNS = [
+    'pontoCaptura', 'cidade', 'uf', 'codigoEquipamento',
+    'codigoRodovia', 'sentido', 'refImagem1', 'refImagem2',
+    'sistemaOrigem', 'tipoInferidoIA', 'marcaModeloInferidoIA'
+]
+BOOLEAN_COLUMNS = ['ehEquipamentoMovel', 'ehLeituraHumana']
+
+# Textos aceitos nos campos booleanos (os demais ficam com o DEFAULT da tabela)
+BOOLEAN_VALUES = {
+    'true': True, '1': True, 'sim': True, 'yes': True,
+    'false': False, '0': False, 'não': False, 'no': False
+}
+
+# Diretórios onde o PostgreSQL costuma criar o socket Unix (Linux/macOS)
+UNIX_SOCKET_DIRS = ('/var/run/postgresql', '/tmp')
+
+def prefer_unix_socket(db_config):
+    """Troca host='localhost' pelo socket Unix local (sem a pilha TCP) quando ele existir e aceitar a conexão"""
+    if db_config.host != 'localhost':
+        return db_config
     
-    # Se já tem ponto, retornar como está
-    if '.' in str_value and ',' not in str_value:
+    for socket_dir in UNIX_SOCKET_DIRS:
+        if not os.path.exists(os.path.join(socket_dir, f'.s.PGSQL.{db_config.port}')):
+            continue
+        
+        socket_config = replace(db_config, host=socket_dir)
         try:
-            return float(str_value)
-        except:
-            return None
+            psycopg.connect(**socket_config.to_dict(), connect_timeout=5).close()
+        except psycopg.Error:
+            continue  # ex.: autenticação 'peer' no socket; seguir com TCP
+        
+        print(f"🔌 Usando socket Unix: {socket_dir}")
+        return socket_config
     
-    # Se tem vírgula, substituir por ponto
-    if ',' in str_value:
-        try:
-            # Substituir vírgula por ponto
-            fixed_value = str_value.replace(',', '.')
-            return float(fixed_value)
-        except:
-            return None
+    return db_config
+
+# Índices secundários de passagens (fora chave primária e constraints), com a definição para recriá-los
+SECONDARY_INDEXES_SQL = """
+    SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid)
+    FROM pg_index
+    WHERE indrelid = 'passagens'::regclass
+      AND NOT indisprimary
+      AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = indexrelid)
+"""
+
+def drop_passagens_indexes(conn):
+    """Remove os índices secundários de passagens e retorna as definições para recriá-los"""
+    with conn.cursor() as cur:
+        cur.execute(SECONDARY_INDEXES_SQL)
+        indexes = cur.fetchall()
+        for index_name, _ in indexes:
+            cur.execute(f"DROP INDEX IF EXISTS {index_name}")
+        conn.commit()
     
-    # Tentar converter diretamente
-    try:
-        return float(str_value)
-    except:
-        return None
+    print(f"⚙️ {len(indexes)} índices removidos durante a carga")
+    return indexes
 
-def fix_date_format(value):
-    """Converte data do formato brasileiro para formato ISO"""
-    if pd.isna(value) or value == '' or str(value).lower() == 'null':
-        return None
+def recreate_passagens_indexes(conn, indexes):
+    """Recria os índices removidos por drop_passagens_indexes (uma única vez, no final da carga)"""
+    print(f"⚙️ Recriando {len(indexes)} índices...")
     
-    str_value = str(value).strip()
+    # Descartar uma transação abortada por falha na carga
+    conn.rollback()
     
-    # Formato: DD/MM/YYYY, HH:MM:SS
-    if '/' in str_value and ',' in str_value:
-        try:
-            # Separar data e hora
-            date_part, time_part = str_value.split(', ')
-            day, month, year = date_part.split('/')
-            
-            # Reorganizar para YYYY-MM-DD HH:MM:SS
-            iso_format = f"{year}-{month.zfill(2)}-{day.zfill(2)} {time_part}"
-            return iso_format
-        except:
-            return None
+    with conn.cursor() as cur:
+        cur.execute("SET maintenance_work_mem = '1GB'")
+        for _, index_definition in indexes:
+            cur.execute(index_definition)
+        conn.commit()
+
+def iter_passages_csv(csv_file, columns):
+    """Lê o CSV em blocos, todas as colunas como texto (PyArrow em streaming quando disponível)"""
+    # Todas as colunas como texto: a conversão de datas/números é feita na limpeza
+    if PYARROW_AVAILABLE:
+        reader = pa_csv.open_csv(
+            csv_file,
+            read_options=pa_csv.ReadOptions(block_size=CHUNK_BYTES),
+            # Campos entre aspas podem conter quebras de linha (CSV válido)
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={col: pa.string() for col in columns},
+                strings_can_be_null=True
+            )
+        )
+        for batch in reader:
+            yield batch.to_pandas(types_mapper=pd.ArrowDtype)
+        return
     
-    return str_value
+    yield from pd.read_csv(csv_file, dtype='string', chunksize=CHUNK_SIZE)
+
+def copy_rows(conn, cur, copy_sql, rows, row_numbers):
+    """Envia as linhas num COPY; se o banco recusar algum valor, divide o lote ao meio
+    até isolar as linhas recusadas, que são descartadas (as demais são mantidas).
+    Retorna (importadas, [(número da linha, erro), ...])"""
+    try:
+        # Cada tentativa é uma transação própria: a falha desfaz só esta parte do lote
+        with conn.transaction():
+            with cur.copy(copy_sql) as copy:
+                for values in rows:
+                    copy.write_row(values)
+        return len(rows), []
+    except psycopg.Error as e:
+        if len(rows) == 1:
+            return 0, [(row_numbers[0], e)]
+    
+    middle = len(rows) // 2
+    imported_left, rejected_left = copy_rows(conn, cur, copy_sql, rows[:middle], row_numbers[:middle])
+    imported_right, rejected_right = copy_rows(conn, cur, copy_sql, rows[middle:], row_numbers[middle:])
+    return imported_left + imported_right, rejected_left + rejected_right
+
+def resolve_aliases(columns):
+    """Mapa alias -> nome padrão, apenas para colunas padrão ausentes no CSV"""
+    renames = {}
+    for alias, col in COLUMN_ALIASES.items():
+        if alias in columns and col not in columns and col not in renames.values():
+            renames[alias] = col
+    return renames
+
+def column_to_values(series):
+    """Converte a coluna em objetos Python, com None onde a máscara de nulos indicar NA/NaN/NaT"""
+    values = series.to_numpy(dtype=object, copy=True)
+    values[series.isna().to_numpy()] = None
+    return values
+
+def clean_text(series):
+    """Remove espaços das bordas da coluna; vazios e 'nan' viram NA"""
+    text = series.astype('string').str.strip()
+    return text.mask(text.isin(['', 'nan']))
+
+def fix_coordinate_format(series):
+    """Converte coordenadas do formato brasileiro (vírgula) para formato internacional (ponto)"""
+    text = series.astype('string').str.strip().str.replace(',', '.', regex=False)
+    # Vazios, 'null', 'nan' e demais valores inválidos viram NaN
+    return pd.to_numeric(text, errors='coerce')
 
-def import_csv_robust(csv_file):
-    """Importa CSV de forma robusta com commits frequentes"""
+def import_csv_robust(csv_file, truncate=True):
+    """Importa CSV de forma robusta com commits frequentes
+    (truncate=True esvazia passagens e reinicia os IDs antes da carga; False só acrescenta)"""
     
     print(f"📥 Importando: {csv_file}")
     
@@ -83,176 +219,167 @@ def import_csv_robust(csv_file):
     print(f"📁 Tamanho do arquivo: {file_size:.2f} MB")
     
     # Configuração do banco
-    db_config = DatabaseConfig(
+    db_config = prefer_unix_socket(DatabaseConfig(
         host='localhost',
         port=5432,
         dbname='sentinela_treino',
         user='postgres',
         password='Jmkjmk.00'
-    )
+    ))
     
     try:
-        # Ler CSV com configurações especiais
+        # Ler apenas o cabeçalho e uma amostra: o arquivo é processado em blocos
         print("📊 Lendo arquivo CSV...")
-        df = pd.read_csv(csv_file, low_memory=False)
-        print(f"✅ {len(df):,} linhas carregadas")
+        sample = pd.read_csv(csv_file, nrows=3)
         
         # Mostrar colunas
         print(f"\n📋 Colunas encontradas:")
-        for i, col in enumerate(df.columns, 1):
+        for i, col in enumerate(sample.columns, 1):
             print(f"   {i:2d}. {col}")
         
         # Mostrar primeiras linhas
         print(f"\n📊 Primeiras 3 linhas:")
-        print(df.head(3).to_string())
+        print(sample.to_string())
+        
+        # Colunas com nome alternativo passam a usar o nome padrão
+        header = sample.columns
+        renames = resolve_aliases(header)
+        sample = sample.rename(columns=renames)
         
         # Perguntar se deve continuar
-        resposta = input(f"\nDeseja importar {len(df):,} linhas? (s/n): ").lower().strip()
+        resposta = input(f"\nDeseja importar o arquivo ({file_size:.2f} MB)? (s/n): ").lower().strip()
         if resposta not in ['s', 'sim', 'y', 'yes']:
             print("❌ Importação cancelada")
             return False
         
         # Limpar tabela existente
-        print("🧹 Limpando tabela existente...")
-        with get_db_connection(db_config) as conn:
-            with conn.cursor() as cur:
-                cur.execute("DELETE FROM passagens")
-                conn.commit()
-                print("✅ Tabela limpa!")
+        if truncate:
+            print("🧹 Limpando tabela existente...")
+            with get_db_connection(db_config) as conn:
+                with conn.cursor() as cur:
+                    # TRUNCATE é só metadado: não varre as linhas nem gera WAL por linha
+                    cur.execute("TRUNCATE passagens RESTART IDENTITY")
+                    conn.commit()
+                    print("✅ Tabela limpa!")
         
-        # Importar dados em lotes pequenos
+        # Importar dados em lotes
         print("🔄 Importando dados em lotes...")
         start_time = time.time()
         
-        batch_size = 100  # Lotes pequenos para garantir commits
+        # Cada bloco lido é um lote: um único COPY e um único commit
         total_imported = 0
         total_errors = 0
         
-        for batch_start in range(0, len(df), batch_size):
-            batch_end = min(batch_start + batch_size, len(df))
-            batch_df = df.iloc[batch_start:batch_end]
-            
-            print(f"📦 Processando lote {batch_start//batch_size + 1} (linhas {batch_start+1}-{batch_end})")
+        # Colunas enviadas no COPY: as colunas conhecidas presentes no CSV
+        columns = [col for col in PASSAGE_COLUMNS if col in sample.columns]
+        copy_sql = f"COPY passagens ({', '.join(columns)}) FROM STDIN"
+        column_defaults = [(col, COPY_DEFAULTS.get(col)) for col in columns]
+        
+        # Colunas presentes por tipo de limpeza, calculadas uma única vez
+        numeric_columns = [col for col in NUMERIC_COLUMNS if col in sample.columns]
+        text_columns = [col for col in TEXT_COLUMNS if col in sample.columns]
+        bool_columns = [col for col in BOOLEAN_COLUMNS if col in sample.columns]
+        has_required = 'dataHoraUTC' in sample.columns and 'placa' in sample.columns
+        
+        # Uma única conexão e um único cursor para todos os lotes (um commit por lote)
+        with get_db_connection(db_config) as conn, conn.cursor() as cur:
+            # Configurações da sessão, válidas para toda a carga: um COPY de 50 mil linhas
+            # pode passar do timeout padrão da conexão, e os dados podem ser recarregados
+            # do CSV, então o commit de cada lote não precisa esperar o flush do WAL
+            cur.execute("SET statement_timeout = 0")
+            cur.execute("SET synchronous_commit = off")
+            conn.commit()  # um rollback de lote não desfaz as configurações
             
-            with get_db_connection(db_config) as conn:
-                with conn.cursor() as cur:
+            # Índices secundários removidos durante a carga e recriados uma única vez no final
+            indexes = drop_passagens_indexes(conn)
+            try:
+                batch_end = 0
+                for batch_number, batch_df in enumerate(iter_passages_csv(csv_file, header), 1):
+                    batch_start = batch_end
+                    batch_end = batch_start + len(batch_df)
+                    
+                    logger.debug(f"📦 Processando lote {batch_number} (linhas {batch_start+1}-{batch_end})")
+                    
+                    if renames:
+                        batch_df = batch_df.rename(columns=renames)
+                    
+                    # Converter datas, números (vírgula decimal) e textos de forma vetorizada
+                    if 'dataHoraUTC' in columns:
+                        batch_df['dataHoraUTC'] = fix_date_format(batch_df['dataHoraUTC'])
+                    
+                    for col in numeric_columns:
+                        batch_df[col] = fix_coordinate_format(batch_df[col])
+                    
+                    if 'faixa' in columns:
+                        # Inteiro anulável: truncado como o antigo int(float(valor)), inválidos viram NA
+                        batch_df['faixa'] = np.trunc(pd.to_numeric(batch_df['faixa'], errors='coerce')).astype('Int64')
+                    
+                    if 'placa' in columns:
+                        batch_df['placa'] = clean_text(batch_df['placa'])
+                    
+                    for col in text_columns:
+                        batch_df[col] = clean_text(batch_df[col])
+                    
+                    for col in bool_columns:
+                        batch_df[col] = batch_df[col].astype('string').str.strip().str.lower().map(BOOLEAN_VALUES)
+                    
+                    # Validação vetorizada: só entram linhas com data e placa válidas
+                    if has_required:
+                        valid = batch_df['dataHoraUTC'].notna() & batch_df['placa'].notna()
+                    else:
+                        valid = pd.Series(False, index=batch_df.index)
+                    
                     batch_imported = 0
-                    batch_errors = 0
+                    batch_errors = int((~valid).sum())
                     
-                    for index, row in batch_df.iterrows():
-                        try:
-                            # Mapear dados com tratamento especial
-                            data = {}
-                            
-                            # Tratar data
-                            if 'dataHoraUTC' in df.columns:
-                                data['dataHoraUTC'] = fix_date_format(row['dataHoraUTC'])
-                            
-                            # Tratar placa
-                            if 'placa' in df.columns:
-                                placa_val = str(row['placa']).strip() if pd.notna(row['placa']) else None
-                                if placa_val and placa_val != 'nan' and placa_val != '':
-                                    data['placa'] = placa_val
-                            
-                            # Tratar coordenadas com vírgula
-                            if 'latitude' in df.columns:
-                                data['latitude'] = fix_coordinate_format(row['latitude'])
-                            
-                            if 'longitude' in df.columns:
-                                data['longitude'] = fix_coordinate_format(row['longitude'])
-                            
-                            # Tratar outros campos numéricos
-                            if 'km' in df.columns:
-                                data['km'] = fix_coordinate_format(row['km'])
-                            
-                            if 'velocidade' in df.columns:
-                                data['velocidade'] = fix_coordinate_format(row['velocidade'])
-                            
-                            if 'faixa' in df.columns:
-                                faixa_val = row['faixa']
-                                if pd.notna(faixa_val):
-                                    try:
-                                        data['faixa'] = int(float(faixa_val))
-                                    except:
-                                        data['faixa'] = None
-                            
-                            # Tratar outros campos de texto
-                            text_fields = [
-                                'pontoCaptura', 'cidade', 'uf', 'codigoEquipamento', 
-                                'codigoRodovia', 'sentido', 'refImagem1', 'refImagem2',
-                                'sistemaOrigem', 'tipoInferidoIA', 'marcaModeloInferidoIA'
-                            ]
-                            
-                            for field in text_fields:
-                                if field in df.columns:
-                                    value = row[field]
-                                    if pd.notna(value) and str(value).strip() != '' and str(value).strip() != 'nan':
-                                        data[field] = str(value).strip()
-                            
-                            # Tratar campos booleanos
-                            bool_fields = ['ehEquipamentoMovel', 'ehLeituraHumana']
-                            for field in bool_fields:
-                                if field in df.columns:
-                                    value = row[field]
-                                    if pd.notna(value):
-                                        if str(value).lower() in ['true', '1', 'sim', 'yes']:
-                                            data[field] = True
-                                        elif str(value).lower() in ['false', '0', 'não', 'no']:
-                                            data[field] = False
-                            
-                            # Inserir apenas se tiver dados essenciais
-                            if 'dataHoraUTC' in data and 'placa' in data and data['dataHoraUTC'] and data['placa']:
-                                columns = list(data.keys())
-                                values = list(data.values())
-                                placeholders = ', '.join(['%s'] * len(values))
-                                
-                                sql = f"""
-                                    INSERT INTO passagens ({', '.join(columns)})
-                                    VALUES ({placeholders})
-                                """
-                                
-                                cur.execute(sql, values)
-                                batch_imported += 1
-                            else:
-                                batch_errors += 1
-                                
-                        except Exception as e:
-                            batch_errors += 1
-                            if batch_errors <= 3:  # Mostrar apenas os primeiros 3 erros por lote
-                                print(f"   ⚠️ Erro na linha {index + 1}: {e}")
-                            continue
+                    # Tuplas montadas direto das colunas (uma máscara de nulos por coluna, sem dict por linha)
+                    valid_df = batch_df.loc[valid]
+                    rows = list(zip(*(
+                        column_to_values(valid_df[col].fillna(default) if default is not None else valid_df[col])
+                        for col, default in column_defaults
+                    )))
+                    row_numbers = (np.flatnonzero(valid.to_numpy()) + batch_start + 1).tolist()
+                    
+                    # Inserir o lote inteiro num único COPY (com commit); só as linhas
+                    # recusadas pelo banco são descartadas
+                    batch_imported, rejected = copy_rows(conn, cur, copy_sql, rows, row_numbers)
+                    batch_errors += len(rejected)
+                    for row_number, error in rejected:
+                        # O contexto do erro traz a coluna e o valor recusados
+                        column = (error.diag.context or '').rpartition(', column ')[2]
+                        logger.warning(f"⚠️ Linha {row_number} do lote {batch_number} descartada pelo banco: {error.diag.message_primary or error} ({column})")
                     
-                    # Commit do lote
-                    conn.commit()
                     total_imported += batch_imported
                     total_errors += batch_errors
                     
-                    print(f"   ✅ Lote importado: {batch_imported} sucessos, {batch_errors} erros")
-        
-        total_time = time.time() - start_time
-        
-        print(f"\n✅ Importação concluída!")
-        print(f"📊 Estatísticas finais:")
-        print(f"   ✅ Importadas: {total_imported:,}")
-        print(f"   ❌ Erros: {total_errors:,}")
-        print(f"   📈 Sucesso: {(total_imported/(total_imported+total_errors)*100):.1f}%")
-        print(f"   ⏱️ Tempo: {total_time:.1f} segundos")
-        print(f"   🚀 Velocidade: {total_imported/total_time:.0f} linhas/segundo")
-        
-        # Verificar se os dados foram realmente inseridos
-        print(f"\n🔍 Verificando dados no banco...")
-        with get_db_connection(db_config) as conn:
-            with conn.cursor(row_factory=dict_row) as cur:
-                cur.execute("SELECT COUNT(*) as count FROM passagens")
-                count = cur.fetchone()['count']
-                print(f"📊 Registros no banco: {count:,}")
-                
-                if count > 0:
-                    cur.execute("SELECT placa, cidade, uf, dataHoraUTC FROM passagens ORDER BY dataHoraUTC DESC LIMIT 3")
-                    samples = cur.fetchall()
-                    print(f"📋 Últimas 3 passagens:")
-                    for i, sample in enumerate(samples, 1):
-                        print(f"   {i}. {sample['placa']} - {sample['cidade']}/{sample['uf']} - {sample['dataHoraUTC']}")
+                    logger.debug(f"✅ Lote {batch_number} importado: {batch_imported} sucessos, {batch_errors} erros")
+                    if batch_number % PROGRESS_EVERY == 0:
+                        logger.info(f"📊 Progresso: {batch_end:,} linhas lidas, {total_imported:,} importadas, {total_errors:,} erros")
+            finally:
+                recreate_passagens_indexes(conn, indexes)
+            
+            total_time = time.time() - start_time
+            
+            print(f"\n✅ Importação concluída!")
+            print(f"📊 Estatísticas finais:")
+            print(f"   ✅ Importadas: {total_imported:,}")
+            print(f"   ❌ Erros: {total_errors:,}")
+            print(f"   📈 Sucesso: {(total_imported/(total_imported+total_errors)*100):.1f}%")
+            print(f"   ⏱️ Tempo: {total_time:.1f} segundos")
+            print(f"   🚀 Velocidade: {total_imported/total_time:.0f} linhas/segundo")
+            
+            # Verificar se os dados foram realmente inseridos (na mesma conexão da carga)
+            print(f"\n🔍 Verificando dados no banco...")
+            cur.execute("SELECT COUNT(*) FROM passagens")
+            count = cur.fetchone()[0]
+            print(f"📊 Registros no banco: {count:,}")
+            
+            if count > 0:
+                cur.execute("SELECT placa, cidade, uf, dataHoraUTC FROM passagens ORDER BY dataHoraUTC DESC LIMIT 3")
+                samples = cur.fetchall()
+                print(f"📋 Últimas 3 passagens:")
+                for i, (placa, cidade, uf, data_hora) in enumerate(samples, 1):
+                    print(f"   {i}. {placa} - {cidade}/{uf} - {data_hora}")
         
         return True
                 
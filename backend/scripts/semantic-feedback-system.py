@@ -12,14 +12,34 @@ Usage:
 import os
 import sys
 import json
-import joblib
+import numpy as np
 import psycopg
+from psycopg.conninfo import make_conninfo
+from psycopg.types.json import Jsonb
 import re
 import logging
+import functools
+import queue
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+# Automato Aho-Corasick (opcional) para a busca de palavras-chave
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Pool de conexões (opcional); sem ele, uma conexão por operação
+try:
+    from psycopg_pool import ConnectionPool
+    PSYCOPG_POOL_AVAILABLE = True
+except ImportError:
+    PSYCOPG_POOL_AVAILABLE = False
 
 # ==========================================
 # CONFIGURAÇÕES STANDALONE
@@ -51,8 +71,9 @@ else:
 MODELS_DIR = BASE_DIR / "ml_models" / "trained"
 
 # Configuração de banco (pegando do .env ou valores padrão)
+@functools.cache
 def load_env_config():
-    """Carrega configuração do arquivo .env"""
+    """Carrega configuração do arquivo .env (lido uma única vez por processo)"""
     # Tentar primeiro .env, depois env
     env_file = BASE_DIR / ".env"
     if not env_file.exists():
@@ -67,12 +88,11 @@ def load_env_config():
     
     if env_file.exists():
         try:
-            with open(env_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if '=' in line and not line.strip().startswith('#'):
-                        key, value = line.strip().split('=', 1)
-                        if key in config:
-                            config[key] = value
+            for line in env_file.read_text(encoding='utf-8').splitlines():
+                if '=' in line and not line.strip().startswith('#'):
+                    key, value = line.strip().split('=', 1)
+                    if key in config:
+                        config[key] = value
             logger.info(f"Configurações carregadas de {env_file}")
         except Exception as e:
             logger.warning(f"Erro ao carregar arquivo {env_file}: {e}")
@@ -82,6 +102,13 @@ def load_env_config():
 
 ENV_CONFIG = load_env_config()
 
+# Tempo máximo (s) para o pool abrir a primeira conexão
+POOL_OPEN_TIMEOUT = 10.0
+
+# Escrita assíncrona de feedback: tamanho máximo do lote e espera (s) por mais itens
+FEEDBACK_BATCH_SIZE = 64
+FEEDBACK_BATCH_WAIT = 0.25
+
 @dataclass
 class FeedbackRecord:
     """Registro de feedback do usuário"""
@@ -92,11 +119,27 @@ class FeedbackRecord:
     classificacao_correta: str
     feedback_usuario: str
     timestamp: datetime
+    detalhes: Dict[str, Any] = field(default_factory=dict)  # Detalhes da classificação (coluna metadados)
 
 # ==========================================
 # CLASSIFICADOR STANDALONE
 # ==========================================
 
+# Peso de cada categoria de termos no score (chave = campo em detalhes)
+KEYWORD_WEIGHTS = {
+    'palavras_criticas_found': 0.4,
+    'palavras_suspeitas_found': 0.15,
+    'historias_cobertura_found': 0.2,
+}
+
+SUSPICION_THRESHOLD = 0.35  # Mesmo threshold corrigido
+
+# Resultados de classificação guardados por texto (relatos repetidos/colados)
+CLASSIFY_CACHE_SIZE = 2048
+
+# Pelo menos uma letra (ASCII ou Latin-1) para o texto ter conteúdo real
+_HAS_LETTER = re.compile(r'[a-zA-ZÀ-ÿ]')
+
 class SimpleSemanticClassifier:
     """Classificador semântico simplificado"""
     
@@ -122,114 +165,327 @@ class SimpleSemanticClassifier:
             'estava indo para casa', 'estava esperando alguém', 'não conhecia ninguém',
             'estava voltando do trabalho', 'por acaso estava ali'
         }
+        
+        self._keyword_table = self._build_keyword_table()
+        self._keyword_weights = np.array([peso for _, _, peso in self._keyword_table], dtype=np.float64)
+        self._keyword_automaton = self._build_keyword_automaton() if AHOCORASICK_AVAILABLE else None
+        
+        # Cache por instância; guarda os detalhes congelados (tuplas) para não vazar mutações
+        self._classify_cached = functools.lru_cache(maxsize=CLASSIFY_CACHE_SIZE)(self._classify_frozen)
     
-    def classify_text(self, texto: str) -> Tuple[str, float, float, Dict[str, Any]]:
-        """Classifica texto usando regras simplificadas"""
-        # Validação mais robusta
+    def _build_keyword_table(self) -> Tuple[Tuple[str, str, float], ...]:
+        """Tabela única (termo, categoria, peso) montada uma vez, na ordem críticas → suspeitas → cobertura"""
+        categorias = (
+            ('palavras_criticas_found', self.palavras_criticas),
+            ('palavras_suspeitas_found', self.palavras_suspeitas),
+            ('historias_cobertura_found', self.historias_cobertura),
+        )
+        return tuple(
+            (termo, categoria, KEYWORD_WEIGHTS[categoria])
+            for categoria, termos in categorias
+            for termo in sorted(termos)
+        )
+    
+    def _build_keyword_automaton(self):
+        """Monta um único automato com todos os termos; cada termo aponta para suas linhas da tabela"""
+        linhas: Dict[str, List[int]] = {}
+        for idx, (termo, _, _) in enumerate(self._keyword_table):
+            linhas.setdefault(termo, []).append(idx)
+        
+        automaton = ahocorasick.Automaton()
+        for termo, idxs in linhas.items():
+            automaton.add_word(termo, tuple(idxs))
+        automaton.make_automaton()
+        return automaton
+    
+    def _find_keyword_rows(self, texto_lower: str) -> List[int]:
+        """Índices da tabela de termos presentes no texto (cada termo conta uma vez, na ordem da tabela)"""
+        if self._keyword_automaton is not None:
+            # Uma única passada linear no texto, incluindo termos sobrepostos (droga/drogas)
+            hits = set()
+            for _, idxs in self._keyword_automaton.iter(texto_lower):
+                hits.update(idxs)
+            return sorted(hits)
+        
+        return [idx for idx, (termo, _, _) in enumerate(self._keyword_table) if termo in texto_lower]
+    
+    @staticmethod
+    def _validation_error(texto: str) -> Optional[str]:
+        """Motivo para não classificar o texto (None se o texto for válido)"""
         if not texto:
-            return "SEM_ALTERACAO", 0.9, 0.1, {"erro": "Texto vazio"}
+            return "Texto vazio"
         
         texto_clean = texto.strip()
         if len(texto_clean) < 10:
-            return "SEM_ALTERACAO", 0.9, 0.1, {"erro": "Texto muito curto"}
+            return "Texto muito curto"
         
         # Verificar se tem conteúdo real (não apenas espaços/pontuação)
-        if not re.search(r'[a-zA-ZÀ-ÿ]', texto_clean):
-            return "SEM_ALTERACAO", 0.9, 0.1, {"erro": "Texto sem conteúdo textual"}
+        if not _HAS_LETTER.search(texto_clean):
+            return "Texto sem conteúdo textual"
         
-        texto_lower = texto.lower()
-        score = 0.0
-        detalhes = {
-            'palavras_criticas_found': [],
-            'palavras_suspeitas_found': [],
-            'historias_cobertura_found': []
+        return None
+    
+    def clear_cache(self):
+        """Descarta as classificações em cache (regras ou modelo alterados)"""
+        self._classify_cached.cache_clear()
+    
+    def classify_text(self, texto: str) -> Tuple[str, float, float, Dict[str, Any]]:
+        """Classifica texto usando regras simplificadas"""
+        label, confidence, score, detalhes = self._classify_cached(texto)
+        # Cada chamada recebe listas novas: o chamador pode alterar o dict livremente
+        return label, confidence, score, {
+            chave: list(valor) if isinstance(valor, tuple) else valor
+            for chave, valor in detalhes
         }
+    
+    def _classify_frozen(self, texto: str) -> Tuple[str, float, float, Tuple[Tuple[str, Any], ...]]:
+        """Classificação por regras com detalhes imutáveis (pares chave/valor), própria para cache"""
+        # Validação mais robusta
+        erro = self._validation_error(texto)
+        if erro:
+            return "SEM_ALTERACAO", 0.9, 0.1, (("erro", erro),)
         
-        # 1. Palavras críticas (peso alto - 0.4 cada)
-        for palavra in self.palavras_criticas:
-            if palavra in texto_lower:
-                score += 0.4
-                detalhes['palavras_criticas_found'].append(palavra)
-        
-        # 2. Palavras suspeitas (peso médio - 0.15 cada)
-        for palavra in self.palavras_suspeitas:
-            if palavra in texto_lower:
-                score += 0.15
-                detalhes['palavras_suspeitas_found'].append(palavra)
+        texto_lower = texto.lower()
+        score = 0.0
+        detalhes = {categoria: [] for categoria in KEYWORD_WEIGHTS}
         
-        # 3. Histórias de cobertura (peso médio - 0.2 cada)
-        for historia in self.historias_cobertura:
-            if historia in texto_lower:
-                score += 0.2
-                detalhes['historias_cobertura_found'].append(historia)
+        # Críticas (peso alto - 0.4), suspeitas (0.15) e histórias de cobertura (0.2)
+        for idx in self._find_keyword_rows(texto_lower):
+            termo, categoria, peso = self._keyword_table[idx]
+            score += peso
+            detalhes[categoria].append(termo)
         
         # Normalizar score
         score = min(score, 1.0)
         
         # Classificar
-        THRESHOLD = 0.35  # Mesmo threshold corrigido
-        if score >= THRESHOLD:
+        if score >= SUSPICION_THRESHOLD:
             label = "SUSPEITO"
             confidence = score
         else:
             label = "SEM_ALTERACAO"
             confidence = 1.0 - score
         
-        return label, confidence, score, detalhes
+        return label, confidence, score, tuple((chave, tuple(termos)) for chave, termos in detalhes.items())
+    
+    def classify_batch(self, textos: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Classifica vários textos de uma vez; retorna arrays (labels, confiancas, scores)
+        com os mesmos valores que classify_text daria para cada texto"""
+        n = len(textos)
+        invalidos = np.zeros(n, dtype=bool)
+        doc_ids: List[int] = []
+        linhas: List[int] = []
+        
+        for i, texto in enumerate(textos):
+            if self._validation_error(texto):
+                invalidos[i] = True
+                continue
+            rows = self._find_keyword_rows(texto.lower())
+            doc_ids.extend([i] * len(rows))
+            linhas.extend(rows)
+        
+        # Soma dos pesos por documento em C (mesma ordem de soma do classify_text)
+        scores = np.bincount(np.asarray(doc_ids, dtype=np.intp),
+                             weights=self._keyword_weights[linhas], minlength=n).astype(np.float64, copy=False)
+        np.minimum(scores, 1.0, out=scores)
+        
+        suspeitos = scores >= SUSPICION_THRESHOLD
+        confiancas = np.where(suspeitos, scores, 1.0 - scores)
+        
+        # Textos inválidos: mesmo resultado fixo do classify_text
+        suspeitos[invalidos] = False
+        scores[invalidos] = 0.1
+        confiancas[invalidos] = 0.9
+        
+        labels = np.where(suspeitos, "SUSPEITO", "SEM_ALTERACAO")
+        return labels, confiancas, scores
 
 # ==========================================
 # GERENCIADOR DE BANCO DE DADOS
 # ==========================================
 
+# Texto fixo do INSERT: o psycopg prepara o statement uma vez por conexão
+INSERT_FEEDBACK_SQL = """
+    INSERT INTO semantic_feedback (
+        relato_original, classificacao_ia, confianca_ia, score_suspicao,
+        classificacao_correta, feedback_usuario, timestamp, metadados
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+# Estatísticas pré-agregadas em uma linha (atualizadas a cada gravação de feedback)
+CREATE_STATS_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS semantic_feedback_stats AS
+    SELECT
+        1 AS id,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE classificacao_correta != 'INCERTO') AS avaliados,
+        COUNT(*) FILTER (WHERE classificacao_correta != 'INCERTO'
+                           AND classificacao_ia = classificacao_correta) AS corretos,
+        COALESCE((
+            SELECT jsonb_agg(jsonb_build_array(classe, n) ORDER BY n DESC)
+            FROM (
+                SELECT classificacao_correta AS classe, COUNT(*) AS n
+                FROM semantic_feedback
+                GROUP BY classificacao_correta
+            ) d
+        ), '[]'::jsonb) AS distribuicao
+    FROM semantic_feedback
+    WITH DATA
+"""
+
+# CONCURRENTLY exige índice único e não bloqueia quem está lendo as estatísticas
+REFRESH_STATS_VIEW_SQL = "REFRESH MATERIALIZED VIEW CONCURRENTLY semantic_feedback_stats"
+
+def _feedback_params(feedback: FeedbackRecord) -> tuple:
+    """Parâmetros do INSERT_FEEDBACK_SQL para um registro"""
+    return (
+        feedback.relato_original,
+        feedback.classificacao_ia,
+        feedback.confianca_ia,
+        feedback.score_suspicao,
+        feedback.classificacao_correta,
+        feedback.feedback_usuario,
+        feedback.timestamp,
+        Jsonb(feedback.detalhes)
+    )
+
 class DatabaseManager:
     """Gerenciador de banco standalone"""
     
     def __init__(self):
         self.config = ENV_CONFIG
+        # Pool reaproveita conexões entre operações (sem handshake por feedback)
+        self.pool = self._create_pool() if PSYCOPG_POOL_AVAILABLE else None
+        
+        # Feedbacks vão para uma fila; uma thread grava em lotes sem travar o prompt
+        self._feedback_queue: "queue.Queue[Optional[FeedbackRecord]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._drain_feedback, name="feedback-writer", daemon=True)
+        self._writer.start()
     
-    def get_connection(self):
-        """Cria conexão com banco"""
+    def _conninfo(self) -> str:
+        """String de conexão a partir da configuração (com escape de valores)"""
+        return make_conninfo(
+            host=self.config['DB_HOST'],
+            port=int(self.config['DB_PORT']),
+            dbname=self.config['DB_NAME'],
+            user=self.config['DB_USER'],
+            password=self.config['DB_PASSWORD']
+        )
+    
+    def _create_pool(self):
+        """Abre o pool de conexões; None se o banco não responder (usa conexões avulsas)"""
+        # Banco fora do ar: falhar na hora, em vez de esperar as novas tentativas do pool
+        probe = self._connect()
+        if not probe:
+            return None
+        probe.close()
+        
+        pool = ConnectionPool(self._conninfo(), min_size=1, max_size=4, open=False)
+        try:
+            pool.open(wait=True, timeout=POOL_OPEN_TIMEOUT)
+            return pool
+        except Exception as e:
+            pool.close()
+            logger.warning(f"Pool de conexões indisponível: {e}")
+            return None
+    
+    def _connect(self):
+        """Cria conexão avulsa com banco"""
         try:
-            conn = psycopg.connect(
-                host=self.config['DB_HOST'],
-                port=int(self.config['DB_PORT']),
-                dbname=self.config['DB_NAME'],
-                user=self.config['DB_USER'],
-                password=self.config['DB_PASSWORD']
-            )
-            return conn
+            return psycopg.connect(self._conninfo())
         except Exception as e:
             logger.error(f"Erro de conexão com banco: {e}")
             logger.info(f"Verifique as configurações em {BASE_DIR}/.env")
             return None
     
+    @contextmanager
+    def get_connection(self):
+        """Conexão com banco: emprestada do pool ou avulsa (None se indisponível)"""
+        if self.pool is not None:
+            with self.pool.connection() as conn:
+                yield conn
+            return
+        
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if conn:
+                conn.close()
+    
+    def _drain_feedback(self):
+        """Thread de escrita: agrupa os feedbacks da fila e grava cada lote numa transação"""
+        stop = False
+        while not stop:
+            feedback = self._feedback_queue.get()
+            if feedback is None:
+                self._feedback_queue.task_done()
+                return
+            
+            batch = [feedback]
+            while len(batch) < FEEDBACK_BATCH_SIZE:
+                try:
+                    feedback = self._feedback_queue.get(timeout=FEEDBACK_BATCH_WAIT)
+                except queue.Empty:
+                    break
+                if feedback is None:
+                    stop = True
+                    break
+                batch.append(feedback)
+            
+            saved = self._write_feedback(batch[0]) if len(batch) == 1 else self.save_feedback_many(batch)
+            if not saved:
+                logger.error(f"{len(batch)} feedback(s) não foram gravados no banco")
+            
+            for _ in range(len(batch) + stop):
+                self._feedback_queue.task_done()
+    
+    def flush(self):
+        """Aguarda a gravação de todos os feedbacks enfileirados"""
+        if self._writer.is_alive():
+            self._feedback_queue.join()
+    
+    def close(self):
+        """Grava os feedbacks pendentes, encerra a thread de escrita e fecha o pool de conexões"""
+        if self._writer.is_alive():
+            self._feedback_queue.put(None)
+            self._writer.join()
+        
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+    
     def setup_feedback_table(self):
         """Cria tabela de feedback"""
-        conn = self.get_connection()
-        if not conn:
-            return False
-        
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS semantic_feedback (
-                        id SERIAL PRIMARY KEY,
-                        relato_original TEXT NOT NULL,
-                        classificacao_ia VARCHAR(20) NOT NULL,
-                        confianca_ia NUMERIC(5,3) NOT NULL,
-                        score_suspicao NUMERIC(5,3) NOT NULL,
-                        classificacao_correta VARCHAR(20) NOT NULL,
-                        feedback_usuario TEXT,
-                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        metadados JSONB,
-                        usado_retreinamento BOOLEAN DEFAULT FALSE
-                    )
-                """)
-                
-                # Índices
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON semantic_feedback(timestamp)")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_feedback_classificacao ON semantic_feedback(classificacao_ia, classificacao_correta)")
+            with self.get_connection() as conn:
+                if not conn:
+                    return False
                 
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        CREATE TABLE IF NOT EXISTS semantic_feedback (
+                            id SERIAL PRIMARY KEY,
+                            relato_original TEXT NOT NULL,
+                            classificacao_ia VARCHAR(20) NOT NULL,
+                            confianca_ia NUMERIC(5,3) NOT NULL,
+                            score_suspicao NUMERIC(5,3) NOT NULL,
+                            classificacao_correta VARCHAR(20) NOT NULL,
+                            feedback_usuario TEXT,
+                            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                            metadados JSONB,
+                            usado_retreinamento BOOLEAN DEFAULT FALSE
+                        )
+                    """)
+                    
+                    # Índices
+                    cur.execute("CREATE INDEX IF NOT EXISTS idx_feedback_timestamp ON semantic_feedback(timestamp)")
+                    cur.execute("CREATE INDEX IF NOT EXISTS idx_feedback_classificacao ON semantic_feedback(classificacao_ia, classificacao_correta)")
+                    
+                    # View de estatísticas
+                    cur.execute(CREATE_STATS_VIEW_SQL)
+                    cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_feedback_stats_id ON semantic_feedback_stats(id)")
+                    
                 conn.commit()
                 print("✅ Tabela de feedback configurada")
                 return True
@@ -237,83 +493,88 @@ class DatabaseManager:
         except Exception as e:
             print(f"❌ Erro ao criar tabela: {e}")
             return False
-        finally:
-            if conn:
-                conn.close()
     
     def save_feedback(self, feedback: FeedbackRecord) -> bool:
+        """Enfileira feedback para gravação em segundo plano (retorna imediatamente)"""
+        self._feedback_queue.put(feedback)
+        return True
+    
+    def _write_feedback(self, feedback: FeedbackRecord) -> bool:
         """Salva feedback no banco"""
-        conn = self.get_connection()
-        if not conn:
+        try:
+            with self.get_connection() as conn:
+                if not conn:
+                    return False
+                
+                with conn.cursor() as cur:
+                    cur.execute(INSERT_FEEDBACK_SQL, _feedback_params(feedback), prepare=True)
+                    
+                conn.commit()
+                self._refresh_stats(conn)
+                return True
+                
+        except Exception as e:
+            print(f"❌ Erro ao salvar: {e}")
             return False
+    
+    def save_feedback_many(self, feedbacks: List[FeedbackRecord]) -> bool:
+        """Salva vários feedbacks em uma única transação"""
+        if not feedbacks:
+            return True
         
         try:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO semantic_feedback (
-                        relato_original, classificacao_ia, confianca_ia, score_suspicao,
-                        classificacao_correta, feedback_usuario, timestamp
-                    ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    feedback.relato_original,
-                    feedback.classificacao_ia,
-                    feedback.confianca_ia,
-                    feedback.score_suspicao,
-                    feedback.classificacao_correta,
-                    feedback.feedback_usuario,
-                    feedback.timestamp
-                ))
+            with self.get_connection() as conn:
+                if not conn:
+                    return False
                 
+                with conn.cursor() as cur:
+                    cur.executemany(INSERT_FEEDBACK_SQL, [_feedback_params(f) for f in feedbacks])
+                    
                 conn.commit()
+                self._refresh_stats(conn)
                 return True
                 
         except Exception as e:
-            print(f"❌ Erro ao salvar: {e}")
+            print(f"❌ Erro ao salvar feedbacks: {e}")
             return False
-        finally:
-            if conn:
-                conn.close()
+    
+    def _refresh_stats(self, conn):
+        """Atualiza a view de estatísticas após uma gravação já confirmada"""
+        try:
+            conn.execute(REFRESH_STATS_VIEW_SQL)
+            conn.commit()
+        except Exception as e:
+            # O feedback já está gravado; só as estatísticas ficam para a próxima gravação
+            conn.rollback()
+            logger.warning(f"Não foi possível atualizar semantic_feedback_stats: {e}")
     
     def get_feedback_stats(self) -> Dict[str, Any]:
         """Obtém estatísticas de feedback"""
-        conn = self.get_connection()
-        if not conn:
-            return {}
+        # Incluir nas contagens os feedbacks ainda na fila
+        self.flush()
         
         stats = {}
         try:
-            with conn.cursor() as cur:
-                # Total
-                cur.execute("SELECT COUNT(*) FROM semantic_feedback")
-                stats['total'] = cur.fetchone()[0]
+            with self.get_connection() as conn:
+                if not conn:
+                    return {}
                 
-                if stats['total'] > 0:
-                    # Acurácia
-                    cur.execute("""
-                        SELECT 
-                            COUNT(*) as total,
-                            SUM(CASE WHEN classificacao_ia = classificacao_correta THEN 1 ELSE 0 END) as corretos
-                        FROM semantic_feedback 
-                        WHERE classificacao_correta != 'INCERTO'
-                    """)
-                    acc_data = cur.fetchone()
-                    if acc_data[0] > 0:
-                        stats['acuracia'] = (acc_data[1] / acc_data[0]) * 100
+                with conn.cursor() as cur:
+                    # Uma linha pré-agregada em vez de varrer a tabela de feedback
+                    cur.execute("SELECT total, avaliados, corretos, distribuicao FROM semantic_feedback_stats")
+                    total, avaliados, corretos, distribuicao = cur.fetchone()
+                    stats['total'] = total
                     
-                    # Distribuição
-                    cur.execute("""
-                        SELECT classificacao_correta, COUNT(*) 
-                        FROM semantic_feedback 
-                        GROUP BY classificacao_correta 
-                        ORDER BY COUNT(*) DESC
-                    """)
-                    stats['distribuicao'] = cur.fetchall()
+                    if total > 0:
+                        # Acurácia
+                        if avaliados > 0:
+                            stats['acuracia'] = (corretos / avaliados) * 100
+                        
+                        # Distribuição
+                        stats['distribuicao'] = [tuple(item) for item in distribuicao]
                 
         except Exception as e:
             print(f"❌ Erro ao obter stats: {e}")
-        finally:
-            if conn:
-                conn.close()
         
         return stats
 
@@ -331,14 +592,22 @@ class SemanticFeedbackTester:
         self.has_trained_model = False
         self.trained_model = None
     
+    def close(self):
+        """Libera os recursos de banco"""
+        if self.db:
+            self.db.close()
+    
     def try_load_trained_model(self):
         """Tenta carregar modelo treinado"""
         clf_path = MODELS_DIR / "semantic_agents_clf.joblib"
         
         if clf_path.exists():
             try:
+                # joblib só é importado quando há modelo para carregar (startup mais rápido)
+                import joblib
                 self.trained_model = joblib.load(clf_path)
                 self.has_trained_model = True
+                self.classifier.clear_cache()
                 print("✅ Modelo treinado carregado")
                 return True
             except Exception as e:
@@ -353,7 +622,8 @@ class SemanticFeedbackTester:
         # No futuro, aqui você pode integrar o modelo treinado se disponível
         return self.classifier.classify_text(texto)
     
-    def collect_feedback(self, relato: str, classification: str, confidence: float, score: float) -> Optional[FeedbackRecord]:
+    def collect_feedback(self, relato: str, classification: str, confidence: float, score: float,
+                         details: Optional[Dict[str, Any]] = None) -> Optional[FeedbackRecord]:
         """Coleta feedback do usuário"""
         print(f"\n{'='*60}")
         print(f"📝 RELATO: \"{relato}\"")
@@ -412,7 +682,8 @@ class SemanticFeedbackTester:
             score_suspicao=score,
             classificacao_correta=classificacao_correta,
             feedback_usuario=feedback,
-            timestamp=datetime.now()
+            timestamp=datetime.now(),
+            detalhes=details or {}
         )
     
     def show_stats(self):
@@ -485,7 +756,7 @@ class SemanticFeedbackTester:
                 test_count += 1
                 
                 # Feedback
-                feedback = self.collect_feedback(relato, classification, confidence, score)
+                feedback = self.collect_feedback(relato, classification, confidence, score, details)
                 
                 if feedback:
                     if not self.offline_mode and self.db.save_feedback(feedback):
@@ -538,6 +809,7 @@ def main():
         os.environ['DB_USER'] = args.db_user
         os.environ['DB_PASSWORD'] = args.db_password
     
+    tester = None
     try:
         tester = SemanticFeedbackTester(offline_mode=args.offline)
         tester.run()
@@ -545,6 +817,9 @@ def main():
         print(f"❌ Erro crítico: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if tester:
+            tester.close()
     
     return 0
 